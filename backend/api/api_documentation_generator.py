@@ -6,9 +6,20 @@ from pydantic import BaseModel
 
 class APIDocumentationGenerator:
     """Générateur de documentation technique pour les APIs scientifiques"""
+
+    # Le schéma est entièrement statique : construit une seule fois par processus
+    _openapi_schema: Dict[str, Any] | None = None
     
     def generate_openapi_schema(self) -> Dict[str, Any]:
-        """Génère la documentation OpenAPI complète"""
+        """Génère la documentation OpenAPI complète (mise en cache, ne pas muter)"""
+        
+        cls = type(self)
+        if cls._openapi_schema is None:
+            cls._openapi_schema = self._build_openapi_schema()
+        return cls._openapi_schema
+
+    def _build_openapi_schema(self) -> Dict[str, Any]:
+        """Construit le dictionnaire OpenAPI à partir des générateurs de sections"""
         
         return {
             "openapi": "3.0.0",
@@ -1,14 +1,137 @@
 import os
+import time
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Annotated
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status, Header
-from jose import JWTError, jwt
+from fastapi.concurrency import run_in_threadpool
+import jwt
+from jwt import InvalidTokenError as JWTError
+
+from core.config import get_settings
+from utils.logger import api_logger
 
 
 # ======================
 # AUTH JWT RÉEL
 # ======================
 
-def get_current_active_user(
+SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+
+# Cache des tokens déjà vérifiés, indexé par sha256(token) (jamais le token brut)
+_token_cache: TTLCache = TTLCache(
+    maxsize=10_000,
+    ttl=int(os.getenv("JWT_CACHE_TTL", "30"))
+)
+_token_cache_lock = threading.Lock()
+
+# Révocations connues : user_id -> horodatage (epoch) de la dernière invalidation.
+# Rechargé depuis la base toutes les JWT_REVOCATION_REFRESH secondes par une
+# tâche de fond (lancée au démarrage de l'API) ; le chemin chaud se limite à
+# un dict.get + comparaison avec la date d'émission du token. Seules les
+# révocations plus récentes que la durée de vie d'un token sont chargées ;
+# les plus anciennes sont supprimées toutes les JWT_REVOCATION_PRUNE secondes.
+_REVOCATION_REFRESH_SECONDS = float(os.getenv("JWT_REVOCATION_REFRESH", "15"))
+_REVOCATION_PRUNE_SECONDS = float(os.getenv("JWT_REVOCATION_PRUNE", "3600"))
+_revocations: dict[str, float] = {}
+
+
+class User:
+    def __init__(self, id: str, email: str | None, claims: dict | None = None):
+        self.id = id
+        self.email = email
+        # Claims vérifiés du JWT (profil embarqué à l'émission du token)
+        self.claims = claims or {}
+
+
+def _revocation_horizon() -> datetime:
+    """Tout token émis avant cet instant a expiré : ses révocations sont inutiles"""
+    return datetime.now(timezone.utc) - timedelta(minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+async def _refresh_revocations() -> None:
+    """Recharge les révocations encore utiles depuis la base"""
+    global _revocations
+
+    try:
+        horizon = _revocation_horizon()
+        rows = await get_repository_factory().token_revocations.get_since(horizon)
+    except Exception as e:
+        # On garde la dernière copie connue plutôt que de bloquer l'auth
+        api_logger.warning("Token revocation refresh failed: %s", e)
+        return
+
+    revocations = {
+        row["user_id"]: datetime.fromisoformat(row["revoked_at"]).timestamp()
+        for row in rows
+    }
+    # Une révocation locale plus récente que la lecture n'est pas perdue
+    # (tant qu'elle n'est pas elle-même hors horizon)
+    horizon_ts = horizon.timestamp()
+    for user_id, revoked_at in _revocations.items():
+        if revoked_at > max(revocations.get(user_id, 0.0), horizon_ts):
+            revocations[user_id] = revoked_at
+    _revocations = revocations
+
+
+async def _prune_revocations() -> None:
+    """Supprime en base les révocations hors horizon"""
+    try:
+        await get_repository_factory().token_revocations.delete_before(_revocation_horizon())
+    except Exception as e:
+        api_logger.warning("Token revocation prune failed: %s", e)
+
+
+async def refresh_revocations_periodically() -> None:
+    """Tâche de fond : recharge les révocations à intervalle fixe et purge les anciennes"""
+    loop = asyncio.get_running_loop()
+    next_prune = loop.time()
+    while True:
+        await _refresh_revocations()
+        if loop.time() >= next_prune:
+            await _prune_revocations()
+            next_prune = loop.time() + _REVOCATION_PRUNE_SECONDS
+        await asyncio.sleep(_REVOCATION_REFRESH_SECONDS)
+
+
+async def revoke_user_tokens(user_id: str) -> None:
+    """
+    Invalide tous les tokens émis jusqu'ici pour cet utilisateur : en base
+    pour les autres processus, immédiatement pour celui-ci
+    """
+    revoked_at = await get_repository_factory().token_revocations.revoke_user(user_id)
+    _revocations[user_id] = revoked_at.timestamp()
+
+
+def _issued_at(payload: dict) -> float | None:
+    # iat_us (microsecondes) départage un token émis dans la même seconde
+    # qu'une révocation ; iat seul pour les tokens plus anciens
+    issued_at_us = payload.get("iat_us")
+    if issued_at_us is not None:
+        return issued_at_us / 1_000_000
+    return payload.get("iat")
+
+
+def _is_revoked(user_id: str, issued_at: float | None) -> bool:
+    revoked_at = _revocations.get(user_id)
+    if revoked_at is None:
+        return False
+    return (issued_at or 0.0) <= revoked_at
+
+
+def _revoked_token_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="JWT révoqué",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_active_user(
     authorization: str = Header(...)
 ):
     """
@@ -22,10 +145,14 @@ def get_current_active_user(
             detail="Authorization header invalide"
         )
 
-    token = authorization.replace("Bearer ", "")
+    token = authorization[7:].strip()
 
-    SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token manquant",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     if not SECRET_KEY:
         raise HTTPException(
@@ -33,8 +160,25 @@ def get_current_active_user(
             detail="JWT_SECRET_KEY non configurée"
         )
 
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        user, expires_at, issued_at = cached
+        if expires_at is None or expires_at > time.time():
+            if _is_revoked(user.id, issued_at):
+                raise _revoked_token_exception()
+            return user
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Vérification HMAC hors de la boucle d'événements
+        payload = await run_in_threadpool(
+            jwt.decode,
+            token,
+            SECRET_KEY,
+            algorithms=[ALGORITHM],
+            options={"require": ["exp", "sub"]},
+        )
 
         user_id: str | None = payload.get("sub")
         email: str | None = payload.get("email")
@@ -45,12 +189,18 @@ def get_current_active_user(
                 detail="Token invalide (sub manquant)"
             )
 
-        class User:
-            def __init__(self, id: str, email: str | None):
-                self.id = id
-                self.email = email
+        issued_at = _issued_at(payload)
+        if _is_revoked(user_id, issued_at):
+            raise _revoked_token_exception()
+
+        user = User(id=user_id, email=email, claims=payload)
+
+        # L'entrée ne doit jamais survivre à l'expiration du token
+        expires_at = payload.get("exp")
+        with _token_cache_lock:
+            _token_cache[cache_key] = (user, expires_at, issued_at)
 
-        return User(id=user_id, email=email)
+        return user
 
     except JWTError:
         raise HTTPException(
@@ -64,34 +214,50 @@ def get_current_active_user(
 # SUPABASE (FACTORY)
 # ======================
 
-from supabase import create_client, Client
+from database.repositories import RepositoryFactory
+from database.supabase_client import get_admin_supabase
 
+_repo_factory: RepositoryFactory | None = None
+_repo_factory_lock = threading.Lock()
 
-def get_repository_factory():
+
+def get_repository_factory() -> RepositoryFactory:
     """
-    Initialise le client Supabase (singleton par requête)
+    Retourne la RepositoryFactory partagée par tout le processus, adossée
+    au client Supabase admin unique (et donc à un seul pool de connexions
+    HTTP keep-alive, partagé avec le reste du backend)
     """
+    global _repo_factory
 
-    SUPABASE_URL = os.getenv("SUPABASE_URL")
-    SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if _repo_factory is not None:
+        return _repo_factory
 
-    if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="Supabase mal configuré (URL ou KEY manquante)"
-        )
+    with _repo_factory_lock:
+        if _repo_factory is None:
+            try:
+                _repo_factory = RepositoryFactory(get_admin_supabase())
+            except Exception as e:
+                api_logger.error("Supabase admin client unavailable: %s", e)
+                raise HTTPException(
+                    status_code=500,
+                    detail="Supabase mal configuré (URL ou KEY manquante)"
+                )
+
+    return _repo_factory
 
-    supabase: Client = create_client(
-        SUPABASE_URL,
-        SUPABASE_SERVICE_ROLE_KEY
-    )
 
-    return supabase
+async def close_repository_factory() -> None:
+    """Vide les insertions groupées encore en file (arrêt de l'API)"""
+    if _repo_factory is not None:
+        await _repo_factory.aclose()
 
 
 # ======================
 # DEPENDENCY ALIASES
 # ======================
 
-CurrentUser = Annotated[object, Depends(get_current_active_user)]
-RepoFactory = Annotated[object, Depends(get_repository_factory)]
+# Toujours passer par ces alias : une seule clé de cache de dépendance
+# par requête, donc un seul décodage JWT même si plusieurs sous-dépendances
+# réclament l'utilisateur courant.
+CurrentUser = Annotated[User, Depends(get_current_active_user, use_cache=True)]
+RepoFactory = Annotated[RepositoryFactory, Depends(get_repository_factory, use_cache=True)]
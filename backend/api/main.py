@@ -1,8 +1,17 @@
 import os
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from api.dependencies import close_repository_factory, refresh_revocations_periodically
+from database.supabase_client import SupabaseClient
+from orchestration.context_manager import context_manager
+from utils.cache import close_redis
+
 from .routers import (
     auth,
     organization,
@@ -23,7 +32,16 @@ from .routers import (
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 NeuroPhysics API démarrée")
+    revocations_task = asyncio.create_task(refresh_revocations_periodically())
     yield
+    # Tâche de rafraîchissement annulée et attendue avant de fermer les clients qu'elle utilise
+    revocations_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await revocations_task
+    await close_repository_factory()
+    await context_manager.aclose()
+    await close_redis()
+    SupabaseClient.close()
     print("🛑 NeuroPhysics API arrêtée")
 
 
@@ -31,6 +49,7 @@ app = FastAPI(
     title="NeuroPhysics Lab Backend",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -44,13 +63,15 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=[
         "Authorization",
         "Content-Type",
         "X-Client-Info",
         "apikey",
     ],
+    # Le navigateur garde le preflight 24h : plus d'OPTIONS sur les routes chaudes
+    max_age=86400,
 )
 
 
@@ -58,39 +79,61 @@ app.add_middleware(
 # ROOT (IMPORTANT)
 # ======================
 
+# Payload invariant : sérialisé une seule fois à l'import
+_ROOT_BYTES = orjson.dumps({
+    "name": "NeuroPhysics Lab Backend",
+    "status": "running",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/health",
+})
+
+
 @app.get("/")
 def root():
-    return {
-        "name": "NeuroPhysics Lab Backend",
-        "status": "running",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health",
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 # ======================
 # ROUTERS
 # ======================
 
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(organization.router, prefix="/api/v1/organizations", tags=["Organizations"])
-app.include_router(pinn_solver.router, prefix="/api/v1/pinn", tags=["PINN Solver"])
-app.include_router(copilot.router, prefix="/api/v1/copilot", tags=["Copilot"])
-app.include_router(digital_twins.router, prefix="/api/v1/digital-twins", tags=["Digital Twins"])
-app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
-app.include_router(orchestrator.router, prefix="/api/v1/orchestrator", tags=["Orchestrator"])
-app.include_router(async_tasks.router, prefix="/api/v1/tasks", tags=["Async Tasks"])
-app.include_router(vector_db.router, prefix="/api/v1/vector-db", tags=["Vector DB"])
+_ROUTERS = (
+    (auth, "/api/v1/auth", "Authentication"),
+    (organization, "/api/v1/organizations", "Organizations"),
+    (pinn_solver, "/api/v1/pinn", "PINN Solver"),
+    (copilot, "/api/v1/copilot", "Copilot"),
+    (digital_twins, "/api/v1/digital-twins", "Digital Twins"),
+    (analytics, "/api/v1/analytics", "Analytics"),
+    (orchestrator, "/api/v1/orchestrator", "Orchestrator"),
+    (async_tasks, "/api/v1/tasks", "Async Tasks"),
+    (vector_db, "/api/v1/vector-db", "Vector DB"),
+)
+
+for module, prefix, tag in _ROUTERS:
+    app.include_router(module.router, prefix=prefix, tags=[tag])
 
 
 # ======================
 # HEALTH CHECK
 # ======================
 
+# Sondé en permanence par le load balancer : aucune allocation par requête
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "environment": os.getenv("ENVIRONMENT", "development"),
+})
+
+
 @app.get("/health")
 def health():
-    return {
-        "status": "healthy",
-        "environment": os.getenv("ENVIRONMENT", "development"),
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+
+@app.get("/health/db")
+async def health_db():
+    # Sonde de disponibilité (readiness) : un vrai aller-retour Supabase,
+    # volontairement séparée de /health qui reste sans I/O
+    if await asyncio.to_thread(SupabaseClient.healthcheck):
+        return Response(content=_HEALTH_BYTES, media_type="application/json")
+    return ORJSONResponse(status_code=503, content={"status": "unhealthy", "database": "unreachable"})
@@ -1,33 +1,15 @@
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from slowapi.errors import RateLimitExceeded
 import logging
 
-from core.exceptions import (
-    RDAcceleratorException, 
-    PhysicsValidationError,
-    SimulationError,
-    QuotaExceededError,
-    AuthenticationError,
-    AuthorizationError,
-    ResourceNotFoundError
-)
+from core.exceptions import RDAcceleratorException
 
 logger = logging.getLogger("api")
 
-async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={
-            "detail": "Internal server error",
-            "type": "internal_error"
-        }
-    )
-
 async def rd_accelerator_exception_handler(request: Request, exc: RDAcceleratorException):
     logger.warning(f"Business exception: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
@@ -36,7 +18,7 @@ async def rd_accelerator_exception_handler(request: Request, exc: RDAcceleratorE
     )
 
 async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=429,
         content={
             "detail": "Rate limit exceeded",
@@ -45,7 +27,7 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
     )
 
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
@@ -54,15 +36,10 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
 def setup_exception_handlers(app):
-    app.add_exception_handler(Exception, global_exception_handler)
+    # Unhandled exceptions fall through to Starlette's ServerErrorMiddleware,
+    # which already logs them and returns a plain 500.
+    # Subclasses of RDAcceleratorException are matched via the MRO, so the
+    # base registration covers PhysicsValidationError, SimulationError, etc.
     app.add_exception_handler(RDAcceleratorException, rd_accelerator_exception_handler)
     app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     app.add_exception_handler(HTTPException, http_exception_handler)
-    
-    # Specific exception handlers
-    app.add_exception_handler(PhysicsValidationError, rd_accelerator_exception_handler)
-    app.add_exception_handler(SimulationError, rd_accelerator_exception_handler)
-    app.add_exception_handler(QuotaExceededError, rd_accelerator_exception_handler)
-    app.add_exception_handler(AuthenticationError, rd_accelerator_exception_handler)
-    app.add_exception_handler(AuthorizationError, rd_accelerator_exception_handler)
-    app.add_exception_handler(ResourceNotFoundError, rd_accelerator_exception_handler)
@@ -1,18 +1,67 @@
+import ipaddress
+import os
+from functools import lru_cache
+from types import MappingProxyType
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request
 
-limiter = Limiter(key_func=get_remote_address)
 
-# Rate limit configuration
-rate_limit_config = {
+# Reverse proxies dont l'en-tête X-Forwarded-For fait foi (adresses ou
+# réseaux CIDR, séparés par des virgules). Vide : l'en-tête est ignoré.
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in os.getenv("TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def get_client_ip(request: Request) -> str:
+    # X-Forwarded-For n'est lu que si la connexion vient d'un proxy de
+    # confiance (sinon un client choisirait librement son compartiment) ;
+    # on remonte la chaîne depuis la droite jusqu'au premier saut non fiable.
+    remote_address = get_remote_address(request)
+    if not _is_trusted_proxy(remote_address):
+        return remote_address
+
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        for hop in reversed(forwarded_for.split(",")):
+            hop = hop.strip()
+            if hop and not _is_trusted_proxy(hop):
+                return hop
+    return remote_address
+
+
+limiter = Limiter(
+    key_func=get_client_ip,
+    storage_uri="memory://",
+    strategy="fixed-window"
+)
+
+# Rate limit configuration (read-only)
+rate_limit_config = MappingProxyType({
     "default": "100/minute",
     "pinn_simulation": "10/minute",
-    "copilot_analysis": "30/minute", 
+    "copilot_analysis": "30/minute",
     "auth": "5/minute",
     "digital_twin_optimization": "5/minute"
-}
+})
 
+@lru_cache(maxsize=None)
 def get_rate_limit(key: str) -> str:
     return rate_limit_config.get(key, rate_limit_config["default"])
+
+# Warm the cache for every known key
+for _key in rate_limit_config:
+    get_rate_limit(_key)
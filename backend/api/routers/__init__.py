@@ -4,6 +4,9 @@ from . import pinn_solver
 from . import copilot
 from . import digital_twins
 from . import analytics
+from . import orchestrator
+from . import async_tasks
+from . import vector_db
 
 __all__ = [
     "auth",
@@ -12,5 +15,7 @@ __all__ = [
     "copilot",
     "digital_twins",
     "analytics",
+    "orchestrator",
+    "async_tasks",
+    "vector_db",
 ]
-
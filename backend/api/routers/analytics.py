@@ -1,6 +1,7 @@
 # backend/api/routers/analytics.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any
 from models.pydantic_models import UsageMetricsResponse, PerformanceAnalyticsResponse
 from api.dependencies import get_current_active_user
@@ -13,6 +14,7 @@ router = APIRouter(
     # Dépendance simulée pour l'utilisateur
     # dependencies=[Depends(get_current_active_user)], 
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 # Initialisation du service d'analyse (simulé)
@@ -26,22 +28,58 @@ class MockUser:
 def get_mock_user():
     return MockUser()
 
+# Réponses simulées construites (et validées) une seule fois à l'import
+_USAGE_METRICS = UsageMetricsResponse(
+    pinn_simulations_this_month=15,
+    copilot_requests_this_month=45,
+    storage_used_mb=125.5,
+    subscription_usage={
+        "used": 15,
+        "total": 100,
+        "percentage": 15
+    }
+)
+
+_PERFORMANCE_ANALYTICS = PerformanceAnalyticsResponse(
+    average_simulation_time=45.2,
+    success_rate=0.92,
+    most_used_physics_models=["navier_stokes", "heat_transfer", "structural"],
+    resource_utilization={
+        "cpu_percent": 65.5,
+        "memory_percent": 72.3,
+        "gpu_utilization": 45.8
+    }
+)
+
+# Corps JSON pré-encodés : ni validation ni sérialisation par requête.
+# Pas de cache Redis devant ces routes : il ne servirait que des octets déjà
+# en mémoire. À poser (clé utilisateur / route / minute) autour de la vraie
+# agrégation quand AnalyticsService sera branché.
+_USAGE_METRICS_JSON = _USAGE_METRICS.model_dump_json(exclude_none=True).encode()
+_PERFORMANCE_ANALYTICS_JSON = _PERFORMANCE_ANALYTICS.model_dump_json(exclude_none=True).encode()
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+_SIMULATION_HISTORY = {
+    "sim_001": {
+        "simulation_id": "sim_001",
+        "status": "COMPLETED",
+        "history": [
+            {"timestamp": "2025-11-26T10:00:00Z", "event": "Simulation started"},
+            {"timestamp": "2025-11-26T10:30:00Z", "event": "Loss reduced to 1e-3"},
+            {"timestamp": "2025-11-26T11:00:00Z", "event": "Simulation COMPLETED"}
+        ]
+    }
+}
+
 @router.get("/usage", response_model=UsageMetricsResponse)
 async def get_usage_metrics(current_user: Any = Depends(get_mock_user)):
     """
     Récupère les métriques d'utilisation pour l'organisation de l'utilisateur.
     """
     # Remplacement par des données simulées
-    return UsageMetricsResponse(
-        pinn_simulations_this_month=15,
-        copilot_requests_this_month=45,
-        storage_used_mb=125.5,
-        subscription_usage={
-            "used": 15,
-            "total": 100,
-            "percentage": 15
-        }
-    )
+    return _json_response(_USAGE_METRICS_JSON)
 
 @router.get("/performance", response_model=PerformanceAnalyticsResponse)
 async def get_performance_analytics(current_user: Any = Depends(get_mock_user)):
@@ -49,16 +87,7 @@ async def get_performance_analytics(current_user: Any = Depends(get_mock_user)):
     Récupère les analyses de performance des simulations PINN.
     """
     # Remplacement par des données simulées
-    return PerformanceAnalyticsResponse(
-        average_simulation_time=45.2,
-        success_rate=0.92,
-        most_used_physics_models=["navier_stokes", "heat_transfer", "structural"],
-        resource_utilization={
-            "cpu_percent": 65.5,
-            "memory_percent": 72.3,
-            "gpu_utilization": 45.8
-        }
-    )
+    return _json_response(_PERFORMANCE_ANALYTICS_JSON)
 
 @router.get("/simulation-history/{simulation_id}")
 async def get_simulation_history(simulation_id: str, current_user: Any = Depends(get_mock_user)):
@@ -66,15 +95,8 @@ async def get_simulation_history(simulation_id: str, current_user: Any = Depends
     Récupère l'historique détaillé d'une simulation spécifique.
     """
     # Remplacement par des données simulées
-    if simulation_id == "sim_001":
-        return {
-            "simulation_id": simulation_id,
-            "status": "COMPLETED",
-            "history": [
-                {"timestamp": "2025-11-26T10:00:00Z", "event": "Simulation started"},
-                {"timestamp": "2025-11-26T10:30:00Z", "event": "Loss reduced to 1e-3"},
-                {"timestamp": "2025-11-26T11:00:00Z", "event": "Simulation COMPLETED"}
-            ]
-        }
+    history = _SIMULATION_HISTORY.get(simulation_id)
+    if history is not None:
+        return history
     else:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Historique de simulation non trouvé.")
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
+import msgpack
+import xxhash
 from utils.logger import logger
 # from celery_app.worker import app as celery_app # Importation simulée
 
@@ -7,6 +10,7 @@ router = APIRouter(
     prefix="/async",
     tags=["Asynchronous Tasks"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 @router.post("/submit")
@@ -29,7 +33,9 @@ async def submit_async_task(task_data: Dict[str, Any]):
         # return {"task_id": task.id, "status": "PENDING"}
         
         # Remplacement par une réponse simulée
-        simulated_task_id = f"task_{hash(task_name + str(task_args) + str(task_kwargs))}"
+        # Identifiant stable entre redémarrages (hash() de CPython est salé)
+        payload = msgpack.packb((task_name, task_args, task_kwargs), use_bin_type=True)
+        simulated_task_id = "task_" + xxhash.xxh3_64_hexdigest(payload)
         return {"task_id": simulated_task_id, "status": "PENDING", "message": "Tâche asynchrone soumise (simulée)."}
         
     except Exception as e:
@@ -51,7 +57,7 @@ async def get_task_status(task_id: str):
     if "error" in task_id:
         status = "FAILURE"
         result = "Erreur simulée lors de l'exécution."
-    elif hash(task_id) % 2 == 0:
+    elif xxhash.xxh3_64_intdigest(task_id) % 2 == 0:  # déterministe entre workers
         status = "SUCCESS"
         result = "Résultat simulé de la tâche."
     else:
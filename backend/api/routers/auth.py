@@ -1,22 +1,48 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
+from pydantic import ValidationError
 from database.supabase_client import get_supabase
 from models.pydantic_models import UserCreate, UserResponse, Token
 from core.security import create_access_token
-from api.dependencies import get_repository_factory, CurrentUser # <-- Ligne 8 corrigée
+from api.dependencies import RepoFactory, CurrentUser, revoke_user_tokens
 from core.exceptions import AuthenticationError
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 security = HTTPBearer()
 
-# ✅ Récupérer le client Supabase via la fonction
-supabase = get_supabase()
+# ✅ Client Supabase créé au premier appel, jamais à l'import
+@lru_cache(maxsize=1)
+def _sb():
+    return get_supabase()
+
+
+def _profile_claims(profile: Any) -> Dict[str, Any]:
+    """
+    Champs de UserResponse embarqués dans le JWT, pour que /me
+    n'ait pas besoin de relire le profil en base
+    """
+    claims = {
+        "sub": profile.id,
+        "email": profile.email,
+        "full_name": profile.full_name,
+        "role": profile.role,
+        "expertise_area": profile.expertise_area,
+    }
+    created_at = getattr(profile, "created_at", None)
+    if created_at is not None:
+        claims["created_at"] = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+    return claims
 
 
 @router.post("/register", response_model=Token)
 async def register(
-    user_data: UserCreate, 
-    repo_factory = Depends(get_repository_factory)
+    user_data: UserCreate,
+    repo_factory: RepoFactory
 ):
     # Vérifier si l'utilisateur existe déjà
     existing_user = await repo_factory.users.get_by_email(user_data.email)
@@ -25,22 +51,21 @@ async def register(
     
     try:
         # Créer l'utilisateur dans Supabase Auth
-        auth_response = supabase.auth.sign_up({
+        # Appel HTTP bloquant : exécuté hors de la boucle d'événements
+        auth_response = await asyncio.to_thread(_sb().auth.sign_up, {
             "email": user_data.email,
             "password": user_data.password
         })
         
         if auth_response.user:
-            # Créer le profil utilisateur dans ta base
+            # Token signé à partir du profil créé en base (mêmes claims
+            # qu'à la connexion, created_at compris) : il dépend de
+            # users.create, les deux ne peuvent pas partir en parallèle
             user_profile = await repo_factory.users.create(
-                user_data, 
+                user_data,
                 auth_response.user.id
             )
-            
-            # Générer le token d'accès
-            access_token = create_access_token(
-                data={"sub": auth_response.user.id}
-            )
+            access_token = create_access_token(data=_profile_claims(user_profile))
             
             return {
                 "access_token": access_token,
@@ -63,18 +88,18 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     user_data: UserCreate,
-    repo_factory = Depends(get_repository_factory)
+    repo_factory: RepoFactory
 ):
     try:
         # Authentifier avec Supabase
-        auth_response = supabase.auth.sign_in_with_password({
+        auth_response = await asyncio.to_thread(_sb().auth.sign_in_with_password, {
             "email": user_data.email,
             "password": user_data.password
         })
         
         if auth_response.user:
             user = await repo_factory.users.get_by_id(auth_response.user.id)
-            access_token = create_access_token(data={"sub": user.id})
+            access_token = create_access_token(data=_profile_claims(user))
             
             return {
                 "access_token": access_token,
@@ -95,16 +120,29 @@ async def login(
 
 
 @router.post("/logout")
-async def logout():
-    supabase.auth.sign_out()
+async def logout(current_user: CurrentUser):
+    # Les JWT déjà émis pour cet utilisateur ne sont plus acceptés
+    await revoke_user_tokens(current_user.id)
+    await asyncio.to_thread(_sb().auth.sign_out)
     return {"message": "Successfully logged out"}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    current_user: CurrentUser # <-- Ligne 107 corrigée
+    current_user: CurrentUser,
+    repo_factory: RepoFactory
 ):
-    return current_user
+    # Profil reconstruit à partir des claims du JWT déjà vérifié : pas
+    # d'aller-retour base, sauf pour un token émis sans le profil complet
+    try:
+        return UserResponse.model_validate({**current_user.claims, "id": current_user.id})
+    except ValidationError:
+        pass
+
+    user = await repo_factory.users.get_by_id(current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse.model_validate(user)
 
 
 @router.post("/refresh-token")
@@ -1,26 +1,49 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from functools import lru_cache
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
 
 from api.dependencies import CurrentUser, RepoFactory
+from utils.http_cache import StaticJSONResponse
 from models.pydantic_models import CodeAnalysisRequest, CodeAnalysisResponse
 from services.copilot_ai_service.code_analyzer import CodeAnalyzer
 from services.copilot_ai_service.gpt_wrapper import GPTWrapper
 from services.copilot_ai_service.fortran_modernizer import FortranModernizer
 from services.copilot_ai_service.physics_validator import PhysicsValidator
 from core.exceptions import CodeAnalysisError
+from utils.logger import copilot_logger
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.post("/analyze-code", response_model=CodeAnalysisResponse)
+# Services sans état par requête : construits une seule fois (au premier
+# appel, pour ne pas exiger la configuration OpenAI à l'import) puis partagés,
+# ce qui réutilise aussi le pool HTTP du client OpenAI.
+@lru_cache(maxsize=None)
+def _code_analyzer() -> CodeAnalyzer:
+    return CodeAnalyzer(GPTWrapper())
+
+@lru_cache(maxsize=None)
+def _fortran_modernizer() -> FortranModernizer:
+    return FortranModernizer()
+
+@lru_cache(maxsize=None)
+def _physics_validator() -> PhysicsValidator:
+    return PhysicsValidator()
+
+def _log_save_failure(future: asyncio.Future):
+    # Données d'apprentissage uniquement : on journalise sans propager
+    if not future.cancelled() and future.exception() is not None:
+        copilot_logger.error("Failed to save code analysis: %s", future.exception())
+
+@router.post("/analyze-code", response_model=CodeAnalysisResponse, response_model_exclude_none=True)
 async def analyze_code(
     request: CodeAnalysisRequest,
     current_user: CurrentUser,
     repo_factory: RepoFactory
 ):
     try:
-        # Initialize services
-        gpt_wrapper = GPTWrapper()
-        code_analyzer = CodeAnalyzer(gpt_wrapper)
+        code_analyzer = _code_analyzer()
         
         # Analyze code
         analysis_result = await code_analyzer.analyze_code(
@@ -29,19 +52,24 @@ async def analyze_code(
             request.context or {}
         )
         
-        # Save analysis for learning
-        await repo_factory.code_analysis.save_analysis(
-            f"session_{current_user.id}",
-            {
-                "original_code": request.code,
-                "analysis_type": request.analysis_type,
-                "suggested_code": analysis_result["suggestions"][0]["suggested_code"] if analysis_result["suggestions"] else "",
-                "explanation": analysis_result["suggestions"][0]["explanation"] if analysis_result["suggestions"] else "",
-                "confidence_score": analysis_result["suggestions"][0]["confidence_score"] if analysis_result["suggestions"] else 0.0,
-                "boundary_conditions_check": analysis_result.get("physics_validation", {}),
-                "performance_metrics": analysis_result.get("performance_metrics", {})
-            }
-        )
+        # Save analysis for learning (batched insert, off the response path)
+        suggestion = analysis_result["suggestions"][0] if analysis_result["suggestions"] else {}
+        try:
+            saved = repo_factory.code_analysis.submit_analysis(
+                f"session_{current_user.id}",
+                {
+                    "original_code": request.code,
+                    "analysis_type": request.analysis_type,
+                    "suggested_code": suggestion.get("suggested_code", ""),
+                    "explanation": suggestion.get("explanation", ""),
+                    "confidence_score": suggestion.get("confidence_score", 0.0),
+                    "boundary_conditions_check": analysis_result.get("physics_validation", {}),
+                    "performance_metrics": analysis_result.get("performance_metrics", {})
+                }
+            )
+            saved.add_done_callback(_log_save_failure)
+        except asyncio.QueueFull:
+            copilot_logger.warning("Code analysis save queue full, dropping analysis")
         
         return CodeAnalysisResponse(**analysis_result)
         
@@ -51,7 +79,7 @@ async def analyze_code(
 @router.post("/modernize-fortran")
 async def modernize_fortran_code(request: CodeAnalysisRequest):
     try:
-        modernizer = FortranModernizer()
+        modernizer = _fortran_modernizer()
         result = await modernizer.modernize_code(
             request.code, 
             request.context or {}
@@ -64,7 +92,7 @@ async def modernize_fortran_code(request: CodeAnalysisRequest):
 @router.post("/validate-physics")
 async def validate_physics_constraints(request: CodeAnalysisRequest):
     try:
-        validator = PhysicsValidator()
+        validator = _physics_validator()
         result = await validator.validate_code_physics(
             request.code, 
             request.context or {}
@@ -74,16 +102,18 @@ async def validate_physics_constraints(request: CodeAnalysisRequest):
     except Exception as e:
         raise CodeAnalysisError(f"Physics validation failed: {str(e)}")
 
+_SUPPORTED_LANGUAGES = StaticJSONResponse({
+    "languages": ["fortran", "python", "cpp", "matlab"],
+    "analysis_types": ["modernization", "debug", "optimization", "physics_validation"],
+    "capabilities": [
+        "Code modernization and translation",
+        "Physics consistency validation", 
+        "Performance optimization suggestions",
+        "Boundary conditions verification",
+        "Numerical stability analysis"
+    ]
+})
+
 @router.get("/supported-languages")
-async def get_supported_languages():
-    return {
-        "languages": ["fortran", "python", "cpp", "matlab"],
-        "analysis_types": ["modernization", "debug", "optimization", "physics_validation"],
-        "capabilities": [
-            "Code modernization and translation",
-            "Physics consistency validation", 
-            "Performance optimization suggestions",
-            "Boundary conditions verification",
-            "Numerical stability analysis"
-        ]
-    }
+async def get_supported_languages(request: Request):
+    return _SUPPORTED_LANGUAGES.respond(request)
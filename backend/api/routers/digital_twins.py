@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any
 
 from api.dependencies import CurrentUser, RepoFactory
+from database.repositories import DEFAULT_PAGE_SIZE
+from utils.http_cache import StaticJSONResponse
 from models.pydantic_models import DigitalTwinCreate, DigitalTwinResponse, OptimizationRequest
+from services.optimization_engine.optimization_solver import OptimizationSolver
+from services.optimization_engine.performance_monitor import PerformanceMonitor
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.post("/digital-twins", response_model=DigitalTwinResponse)
+@router.post("/digital-twins", response_model=DigitalTwinResponse, response_model_exclude_none=True)
 async def create_digital_twin(
     twin_data: DigitalTwinCreate,
     current_user: CurrentUser,
@@ -19,24 +24,24 @@ async def create_digital_twin(
         team_id
     )
     
-    return DigitalTwinResponse(**digital_twin.__dict__)
+    return DigitalTwinResponse.model_validate(digital_twin)
 
-@router.get("/digital-twins", response_model=List[DigitalTwinResponse])
+@router.get("/digital-twins", response_model=List[DigitalTwinResponse], response_model_exclude_none=True)
 async def get_digital_twins(
     current_user: CurrentUser,
-    repo_factory: RepoFactory
+    repo_factory: RepoFactory,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    offset: int = Query(0, ge=0)
 ):
     team_id = "team_123"  # From current_user
-    twins = await repo_factory.digital_twins.get_by_team(team_id)
-    return [DigitalTwinResponse(**twin.__dict__) for twin in twins]
+    twins = await repo_factory.digital_twins.get_by_team(team_id, limit, offset)
+    return [DigitalTwinResponse.model_validate(twin) for twin in twins]
 
 @router.post("/optimize")
 async def run_optimization(
     request: OptimizationRequest,
     current_user: CurrentUser
 ):
-    from services.optimization_engine.optimization_solver import OptimizationSolver
-    
     try:
         solver = OptimizationSolver()
         result = await solver.optimize_system(request)
@@ -50,8 +55,6 @@ async def run_optimization(
 
 @router.get("/digital-twins/{twin_id}/performance")
 async def get_twin_performance(twin_id: str, current_user: CurrentUser):
-    from services.optimization_engine.performance_monitor import PerformanceMonitor
-    
     try:
         monitor = PerformanceMonitor()
         metrics = await monitor.get_performance_metrics(twin_id)
@@ -62,29 +65,31 @@ async def get_twin_performance(twin_id: str, current_user: CurrentUser):
             "error": f"Failed to get performance metrics: {str(e)}"
         }
 
+_OPTIMIZATION_METHODS = StaticJSONResponse({
+    "methods": [
+        {
+            "name": "Genetic Algorithm",
+            "type": "global",
+            "suitable_for": "Multi-objective, non-convex problems"
+        },
+        {
+            "name": "Gradient Descent", 
+            "type": "local",
+            "suitable_for": "Convex problems with smooth gradients"
+        },
+        {
+            "name": "Bayesian Optimization",
+            "type": "global", 
+            "suitable_for": "Expensive black-box functions"
+        },
+        {
+            "name": "Particle Swarm",
+            "type": "global",
+            "suitable_for": "Non-smooth, multi-modal problems"
+        }
+    ]
+})
+
 @router.get("/optimization-methods")
-async def get_optimization_methods():
-    return {
-        "methods": [
-            {
-                "name": "Genetic Algorithm",
-                "type": "global",
-                "suitable_for": "Multi-objective, non-convex problems"
-            },
-            {
-                "name": "Gradient Descent", 
-                "type": "local",
-                "suitable_for": "Convex problems with smooth gradients"
-            },
-            {
-                "name": "Bayesian Optimization",
-                "type": "global", 
-                "suitable_for": "Expensive black-box functions"
-            },
-            {
-                "name": "Particle Swarm",
-                "type": "global",
-                "suitable_for": "Non-smooth, multi-modal problems"
-            }
-        ]
-    }
+async def get_optimization_methods(request: Request):
+    return _OPTIMIZATION_METHODS.respond(request)
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
 # Import relatif (si vous ne lancez pas depuis la racine du projet)
 from orchestration.orchestrator import orchestrator
 from utils.logger import logger
-# from api.dependencies import get_current_user # Dépendance simulée
+# from api.dependencies import get_current_active_user # Dépendance simulée
 
 router = APIRouter(
     prefix="/orchestrator",
     tags=["Orchestrator"],
-    # dependencies=[Depends(get_current_user)], # Sécurité simulée
+    # dependencies=[Depends(get_current_active_user)], # Sécurité simulée
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 @router.post("/process")
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
 from typing import List
 
 from api.dependencies import CurrentUser, RepoFactory
+from utils.http_cache import StaticJSONResponse
 from models.pydantic_models import OrganizationResponse, UserResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.get("/my-organization", response_model=OrganizationResponse)
+@router.get("/my-organization", response_model=OrganizationResponse, response_model_exclude_none=True)
 async def get_my_organization(
     current_user: CurrentUser, 
     repo_factory: RepoFactory
@@ -19,7 +21,7 @@ async def get_my_organization(
         created_at="2024-01-01T00:00:00Z"
     )
 
-@router.get("/team-members", response_model=List[UserResponse])
+@router.get("/team-members", response_model=List[UserResponse], response_model_exclude_none=True)
 async def get_team_members(
     current_user: CurrentUser, 
     repo_factory: RepoFactory
@@ -42,19 +44,21 @@ async def get_team_members(
         )
     ]
 
-@router.get("/subscription")
-async def get_subscription_info(current_user: CurrentUser):
-    return {
-        "plan": "premium",
-        "status": "active",
-        "limits": {
-            "pinn_simulations": 100,
-            "copilot_requests": 1000,
-            "storage_gb": 100
-        },
-        "usage": {
-            "pinn_simulations_used": 15,
-            "copilot_requests_used": 45,
-            "storage_used_gb": 0.125
-        }
+_SUBSCRIPTION_INFO = StaticJSONResponse({
+    "plan": "premium",
+    "status": "active",
+    "limits": {
+        "pinn_simulations": 100,
+        "copilot_requests": 1000,
+        "storage_gb": 100
+    },
+    "usage": {
+        "pinn_simulations_used": 15,
+        "copilot_requests_used": 45,
+        "storage_used_gb": 0.125
     }
+}, cache_control="private, max-age=300")
+
+@router.get("/subscription")
+async def get_subscription_info(request: Request, current_user: CurrentUser):
+    return _SUBSCRIPTION_INFO.respond(request)
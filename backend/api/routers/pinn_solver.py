@@ -1,30 +1,39 @@
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, List
 import asyncio
+import orjson
 
 from api.dependencies import CurrentUser, RepoFactory
+from database.repositories import DEFAULT_PAGE_SIZE
 from models.pydantic_models import (
     PhysicsModelCreate, PhysicsModelResponse, 
-    SimulationCreate, SimulationResponse
+    SimulationCreate, SimulationResponse, SimulationStatus, PhysicsType
 )
-from services.pinns_solver.prediction_service import PinnPredictionService
-from services.pinns_solver.training_manager import TrainingManager
+from celery_app.pinn_tasks import run_pinn_simulation_task
 from utils.validators import PhysicsValidator
 from core.exceptions import PhysicsValidationError, SimulationError
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.post("/physics-models", response_model=PhysicsModelResponse)
+# Validateurs d'équations par type de physique. Ce sont des vérifications
+# en mémoire de quelques microsecondes : on les garde séquentielles sur la
+# boucle plutôt que de payer un aller-retour threadpool par validateur.
+_EQUATION_VALIDATORS = {
+    PhysicsType.NAVIER_STOKES: PhysicsValidator.validate_navier_stokes_params,
+    PhysicsType.HEAT_TRANSFER: PhysicsValidator.validate_heat_transfer_params,
+}
+
+@router.post("/physics-models", response_model=PhysicsModelResponse, response_model_exclude_none=True)
 async def create_physics_model(
     model_data: PhysicsModelCreate,
     current_user: CurrentUser,
     repo_factory: RepoFactory
 ):
     # Validate physics parameters
-    if model_data.physics_type == "navier_stokes":
-        PhysicsValidator.validate_navier_stokes_params(model_data.equations)
-    elif model_data.physics_type == "heat_transfer":
-        PhysicsValidator.validate_heat_transfer_params(model_data.equations)
+    validate_equations = _EQUATION_VALIDATORS.get(model_data.physics_type)
+    if validate_equations:
+        validate_equations(model_data.equations)
     
     PhysicsValidator.validate_boundary_conditions(model_data.boundary_conditions)
     
@@ -40,21 +49,22 @@ async def create_physics_model(
         team_id
     )
     
-    return PhysicsModelResponse(**physics_model.__dict__)
+    return PhysicsModelResponse.model_validate(physics_model)
 
-@router.get("/physics-models", response_model=List[PhysicsModelResponse])
+@router.get("/physics-models", response_model=List[PhysicsModelResponse], response_model_exclude_none=True)
 async def get_physics_models(
     current_user: CurrentUser, 
-    repo_factory: RepoFactory
+    repo_factory: RepoFactory,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    offset: int = Query(0, ge=0)
 ):
     team_id = "team_123"  # From current_user
-    models = await repo_factory.physics_models.get_by_team(team_id)
-    return [PhysicsModelResponse(**model.__dict__) for model in models]
+    models = await repo_factory.physics_models.get_by_team(team_id, limit, offset)
+    return [PhysicsModelResponse.model_validate(model) for model in models]
 
-@router.post("/simulations", response_model=SimulationResponse)
+@router.post("/simulations", response_model=SimulationResponse, response_model_exclude_none=True)
 async def create_simulation(
     simulation_data: SimulationCreate,
-    background_tasks: BackgroundTasks,
     current_user: CurrentUser,
     repo_factory: RepoFactory
 ):
@@ -73,20 +83,43 @@ async def create_simulation(
             team_id
         )
         
-        # Launch simulation in background
-        background_tasks.add_task(
-            run_pinn_simulation,
-            simulation.id,
-            simulation_data,
-            repo_factory
-        )
+        # Launch simulation on a Celery worker (off the API process) ; la
+        # publication sur le broker est bloquante : hors de la boucle
+        try:
+            await asyncio.to_thread(
+                run_pinn_simulation_task.delay,
+                simulation.id,
+                simulation_data.model_dump(mode="json")
+            )
+        except Exception:
+            # Aucun worker ne prendra cette simulation : elle ne doit pas
+            # rester en 'pending'
+            await repo_factory.simulations.update_status(simulation.id, SimulationStatus.FAILED)
+            raise
         
-        return SimulationResponse(**simulation.__dict__)
+        return SimulationResponse.model_validate(simulation)
         
     except Exception as e:
         raise SimulationError(f"Failed to create simulation: {str(e)}")
 
-@router.get("/simulations/{simulation_id}", response_model=SimulationResponse)
+async def _ndjson_simulations(repo_factory, team_id: str) -> AsyncIterator[bytes]:
+    async for simulation in repo_factory.simulations.iter_by_team(team_id):
+        yield orjson.dumps(simulation, option=orjson.OPT_APPEND_NEWLINE)
+
+# Déclarée avant /simulations/{simulation_id} pour que "stream" ne soit pas
+# capturé comme identifiant
+@router.get("/simulations/stream")
+async def stream_simulations(
+    current_user: CurrentUser,
+    repo_factory: RepoFactory
+):
+    team_id = "team_123"  # From current_user
+    return StreamingResponse(
+        _ndjson_simulations(repo_factory, team_id),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/simulations/{simulation_id}", response_model=SimulationResponse, response_model_exclude_none=True)
 async def get_simulation(
     simulation_id: str, 
     repo_factory: RepoFactory
@@ -95,43 +128,15 @@ async def get_simulation(
     if not simulation:
         raise HTTPException(status_code=404, detail="Simulation not found")
     
-    return SimulationResponse(**simulation.__dict__)
+    return SimulationResponse.model_validate(simulation)
 
-@router.get("/simulations", response_model=List[SimulationResponse])
+@router.get("/simulations", response_model=List[SimulationResponse], response_model_exclude_none=True)
 async def get_simulations(
     current_user: CurrentUser,
-    repo_factory: RepoFactory
+    repo_factory: RepoFactory,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    offset: int = Query(0, ge=0)
 ):
     team_id = "team_123"  # From current_user
-    simulations = await repo_factory.simulations.get_by_team(team_id)
-    return [SimulationResponse(**sim.__dict__) for sim in simulations]
-
-async def run_pinn_simulation(
-    simulation_id: str, 
-    simulation_data: SimulationCreate, 
-    repo_factory: RepoFactory
-):
-    """Run PINN simulation in background"""
-    try:
-        # Update status to running
-        await repo_factory.simulations.update_status(simulation_id, "running")
-        
-        # Initialize PINN service
-        pinn_service = PinnPredictionService()
-        
-        # Run simulation
-        results = await pinn_service.run_simulation(simulation_data)
-        
-        # Save results
-        await repo_factory.simulations.update_status(
-            simulation_id, 
-            "completed", 
-            results
-        )
-        
-    except Exception as e:
-        # Update status to failed
-        await repo_factory.simulations.update_status(simulation_id, "failed")
-        
-        # Log error
-        print(f"Simulation {simulation_id} failed: {e}")
+    simulations = await repo_factory.simulations.get_by_team(team_id, limit, offset)
+    return [SimulationResponse.model_validate(sim) for sim in simulations]
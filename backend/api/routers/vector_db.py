@@ -1,16 +1,17 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any, List
-from orchestration.context_manager import ContextManager
+from orchestration.context_manager import context_manager
 from utils.logger import logger
 
 router = APIRouter(
     prefix="/vector_db",
     tags=["Vector Database"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
-# Utilisation du ContextManager pour simuler l'accès à la base vectorielle
-context_manager = ContextManager()
+# ContextManager partagé du processus pour l'accès à la base vectorielle
 
 @router.post("/search")
 async def search_vector_db(search_data: Dict[str, Any]):
@@ -30,7 +31,7 @@ async def search_vector_db(search_data: Dict[str, Any]):
         results = await context_manager.retrieve_context(query, context_id)
         
         # On ne retourne que les documents pertinents pour simuler une recherche
-        return {"query": query, "results": results.get("relevant_documents", [])}
+        return {"query": query, "results": results.relevant_documents}
         
     except Exception as e:
         logger.error(f"Erreur lors de la recherche vectorielle: {e}")
@@ -49,11 +50,7 @@ async def update_vector_context(update_data: Dict[str, Any]):
 
     logger.info(f"Mise à jour du contexte vectoriel pour ID: {context_id}")
     
-    try:
-        # Le ContextManager simule la mise à jour
-        await context_manager.update_context(context_id, new_data)
-        return {"status": "success", "message": f"Contexte {context_id} mis à jour (simulé)."}
-        
-    except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour du contexte: {e}")
-        raise HTTPException(status_code=500, detail=f"Erreur lors de la mise à jour: {e}")
+    # Écriture en tâche de fond : la réponse n'attend pas la base vectorielle
+    if not context_manager.update_context(context_id, new_data):
+        raise HTTPException(status_code=503, detail="File des mises à jour de contexte pleine, réessayez plus tard.")
+    return {"status": "success", "message": f"Mise à jour du contexte {context_id} en file."}
@@ -1,4 +1,6 @@
+import time
 from .worker import app
+from core.config import get_settings
 from utils.logger import logger
 from typing import Dict, Any
 
@@ -14,8 +16,9 @@ def generate_code_suggestion(context: str) -> Dict[str, Any]:
     # service = CopilotService()
     # suggestion = service.generate_code(context)
     
-    import time
-    time.sleep(2)
+    settings = get_settings()
+    if settings.DEBUG and settings.SIMULATE_TASK_LATENCY:
+        time.sleep(2)
     
     suggestion = {
         "status": "completed",
@@ -26,7 +29,7 @@ def generate_code_suggestion(context: str) -> Dict[str, Any]:
     logger.info("Génération de suggestion de code terminée.")
     return suggestion
 
-@app.task(name="copilot_tasks.perform_deep_research")
+@app.task(name="copilot_tasks.perform_deep_research", ignore_result=True)
 def perform_deep_research(topic: str) -> Dict[str, Any]:
     """
     Tâche asynchrone pour effectuer une recherche approfondie sur un sujet scientifique.
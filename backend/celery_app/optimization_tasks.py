@@ -1,4 +1,6 @@
+import time
 from .worker import app
+from core.config import get_settings
 from utils.logger import logger
 from typing import Dict, Any
 
@@ -14,8 +16,9 @@ def run_optimization(config: Dict[str, Any]) -> Dict[str, Any]:
     # solver = OptimizationSolver()
     # results = solver.solve(config)
     
-    import time
-    time.sleep(7) # Simuler un long processus
+    settings = get_settings()
+    if settings.DEBUG and settings.SIMULATE_TASK_LATENCY:
+        time.sleep(7) # Simuler un long processus
     
     results = {
         "status": "completed",
@@ -27,7 +30,7 @@ def run_optimization(config: Dict[str, Any]) -> Dict[str, Any]:
     logger.info("Optimisation terminée.")
     return results
 
-@app.task(name="optimization_tasks.update_surrogate_model")
+@app.task(name="optimization_tasks.update_surrogate_model", ignore_result=True)
 def update_surrogate_model(data_id: str) -> Dict[str, Any]:
     """
     Tâche asynchrone pour mettre à jour le modèle de substitution (surrogate model).
@@ -1,6 +1,63 @@
+import asyncio
+import time
 from .worker import app
+from core.config import get_settings
 from utils.logger import logger
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from database.supabase_client import get_admin_supabase
+from database.repositories import RepositoryFactory
+from models.pydantic_models import SimulationCreate, SimulationStatus
+from services.pinns_solver.prediction_service import PinnPredictionService
+from utils.cache import close_redis
+
+# Un service par processus worker : le cache de modèles chargés survit
+# d'une tâche à l'autre
+_pinn_service: Optional[PinnPredictionService] = None
+
+def _get_pinn_service() -> PinnPredictionService:
+    global _pinn_service
+    if _pinn_service is None:
+        _pinn_service = PinnPredictionService()
+    return _pinn_service
+
+async def _run_pinn_simulation(simulation_id: str, simulation_data: SimulationCreate):
+    repo_factory = RepositoryFactory(get_admin_supabase())
+    try:
+        # Update status to running
+        await repo_factory.simulations.update_status(simulation_id, SimulationStatus.RUNNING)
+        
+        # Run simulation
+        results = await _get_pinn_service().run_simulation(simulation_data)
+        
+        # Save results
+        await repo_factory.simulations.update_status(
+            simulation_id, 
+            SimulationStatus.COMPLETED, 
+            results
+        )
+        
+    except Exception as e:
+        logger.error("Simulation %s failed: %s", simulation_id, e)
+        # Update status to failed ; un échec ici ne doit pas masquer l'erreur
+        # d'origine
+        try:
+            await repo_factory.simulations.update_status(simulation_id, SimulationStatus.FAILED)
+        except Exception as status_error:
+            logger.error("Could not mark simulation %s as failed: %s", simulation_id, status_error)
+        raise
+    finally:
+        # Client Redis lié à la boucle de cet asyncio.run : fermé avec elle
+        await close_redis()
+
+@app.task(name="pinn_tasks.run_pinn_simulation", ignore_result=True)
+def run_pinn_simulation_task(simulation_id: str, simulation_payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Exécute une simulation PINN hors du processus API (lancée par POST /simulations).
+    """
+    logger.info("Démarrage de la simulation PINN %s", simulation_id)
+    simulation_data = SimulationCreate.model_validate(simulation_payload)
+    asyncio.run(_run_pinn_simulation(simulation_id, simulation_data))
+    return {"simulation_id": simulation_id, "status": "completed"}
 
 @app.task(name="pinn_tasks.run_pinn_training")
 def run_pinn_training(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -18,8 +75,9 @@ def run_pinn_training(config: Dict[str, Any]) -> Dict[str, Any]:
     # manager = TrainingManager()
     # results = manager.train(config)
     
-    import time
-    time.sleep(5) # Simuler un long processus
+    settings = get_settings()
+    if settings.DEBUG and settings.SIMULATE_TASK_LATENCY:
+        time.sleep(5) # Simuler un long processus
     
     results = {
         "status": "completed",
@@ -32,7 +90,7 @@ def run_pinn_training(config: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"Entraînement PINN terminé pour {model_name}.")
     return results
 
-@app.task(name="pinn_tasks.analyze_convergence")
+@app.task(name="pinn_tasks.analyze_convergence", ignore_result=True)
 def analyze_convergence(run_id: str) -> Dict[str, Any]:
     """
     Tâche asynchrone pour l'analyse de la convergence d'une exécution PINN.
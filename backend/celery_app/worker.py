@@ -2,13 +2,9 @@ from celery import Celery
 from core.config import get_settings
 from utils.logger import logger
 
-settings = get_settings()
-
 # Configuration Celery (simulée)
 app = Celery(
     'neurophysics_worker',
-    broker=settings.CELERY_BROKER_URL,
-    backend=settings.CELERY_RESULT_BACKEND,
     include=[
         'celery_app.pinn_tasks',
         'celery_app.copilot_tasks',
@@ -18,15 +14,60 @@ app = Celery(
 
 # Configuration de l'application Celery
 app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # msgpack : messages et résultats binaires, plus compacts et plus rapides
+    # à (dé)sérialiser que JSON pour les paramètres/résultats numériques.
+    # JSON reste accepté pour les messages encore en file lors du déploiement.
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
+    result_accept_content=['msgpack', 'json'],
+    # Les résultats non relus (tâches marquées ignore_result) ne sont pas
+    # stockés ; les autres expirent au bout d'une heure
+    result_expires=3600,
     timezone='UTC',
     enable_utc=True,
+    # Tâches longues et hétérogènes (PINN, optimisation, copilot) : un seul
+    # message réservé par process, pour qu'une tâche courte n'attende pas
+    # derrière une longue déjà préchargée. À lancer avec le mode fair :
+    #   celery -A celery_app.worker worker -Ofair --concurrency=<n>
+    worker_prefetch_multiplier=1,
+    # Acquittement après exécution : une tâche est relivrée si le worker meurt
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_disable_rate_limits=True,
+    # Recyclage des process enfants (tenseurs/tableaux NumPy retenus par
+    # l'allocateur) : après 100 tâches ou au-delà de ~2 Go de RSS (en Ko)
+    worker_max_tasks_per_child=100,
+    worker_max_memory_per_child=2_000_000,
+    # Une file par classe de tâches, chacune servie par son propre pool :
+    #   -Q pinn    --concurrency=<nb GPU>
+    #   -Q opt     --concurrency=<nb CPU>
+    #   -Q copilot --concurrency=16 --pool=gevent   (appels LLM, I/O)
+    # Aucun worker copilot n'est déployé : gevent n'est pas dans
+    # requirements.txt, à ajouter à l'image qui servira cette file.
+    task_routes={
+        'pinn_tasks.*': {'queue': 'pinn'},
+        'optimization_tasks.*': {'queue': 'opt'},
+        'copilot_tasks.*': {'queue': 'copilot'},
+    },
     worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] %(message)s",
     worker_task_log_format="[%(asctime)s: %(levelname)s/%(processName)s] %(task_name)s[%(task_id)s]: %(message)s",
 )
 
+def _settings_defaults():
+    # Réglages issus de l'environnement, lus à la première lecture de
+    # app.conf et non à l'import du module
+    settings = get_settings()
+    return {
+        'broker_url': settings.CELERY_BROKER_URL,
+        'result_backend': settings.CELERY_RESULT_BACKEND,
+        # Pool prefork dimensionné pour l'entraînement PINN (surchargeable par l'env)
+        'worker_concurrency': settings.CELERY_WORKER_CONCURRENCY,
+        'broker_pool_limit': settings.CELERY_BROKER_POOL_LIMIT,
+    }
+
+app.add_defaults(_settings_defaults)
+
 logger.info("Celery worker configuré.")
 
 # Tâche de base pour le test
@@ -2,7 +2,7 @@
 from typing import Dict, List, Any
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ArchitectureIssue:
     component: str
     issue_type: str
@@ -10,6 +10,37 @@ class ArchitectureIssue:
     description: str
     recommendation: str
 
+# Points d'échec identifiés entre les trois moteurs : données statiques,
+# construites une seule fois à l'import
+_CRITICAL_POINTS = (
+    {
+        'component': 'pinn_solver -> copilot',
+        'risk': 'Perte de contexte physique lors du débogage',
+        'description': 'Les erreurs de simulation PINN ne sont pas correctement contextualisées pour le Scientific Copilot'
+    },
+    {
+        'component': 'copilot -> digital_twins', 
+        'risk': 'Incohérence des paramètres d\'optimisation',
+        'description': 'Les suggestions de code ne respectent pas les contraintes des jumeaux numériques'
+    },
+    {
+        'component': 'digital_twins -> pinn_solver',
+        'risk': 'Boucle d\'optimisation instable',
+        'description': 'Les paramètres optimisés peuvent causer la divergence des PINN'
+    }
+)
+
+_DATA_FLOW_ISSUES = tuple(
+    ArchitectureIssue(
+        component=point['component'],
+        issue_type='data_flow',
+        severity='high',
+        description=point['description'],
+        recommendation=f"Implémenter un protocole de validation croisée dans {point['component'].replace(' -> ', '_')}_validator.py"
+    )
+    for point in _CRITICAL_POINTS
+)
+
 class ArchitectureValidator:
     """Validateur de l'architecture tri-moteur"""
     
@@ -19,34 +50,8 @@ class ArchitectureValidator:
     def validate_data_flow(self) -> List[ArchitectureIssue]:
         """Valide le flux de données entre les trois moteurs"""
         
-        # Points d'échec identifiés
-        critical_points = [
-            {
-                'component': 'pinn_solver -> copilot',
-                'risk': 'Perte de contexte physique lors du débogage',
-                'description': 'Les erreurs de simulation PINN ne sont pas correctement contextualisées pour le Scientific Copilot'
-            },
-            {
-                'component': 'copilot -> digital_twins', 
-                'risk': 'Incohérence des paramètres d\'optimisation',
-                'description': 'Les suggestions de code ne respectent pas les contraintes des jumeaux numériques'
-            },
-            {
-                'component': 'digital_twins -> pinn_solver',
-                'risk': 'Boucle d\'optimisation instable',
-                'description': 'Les paramètres optimisés peuvent causer la divergence des PINN'
-            }
-        ]
-        
-        for point in critical_points:
-            self.issues.append(ArchitectureIssue(
-                component=point['component'],
-                issue_type='data_flow',
-                severity='high',
-                description=point['description'],
-                recommendation=f"Implémenter un protocole de validation croisée dans {point['component'].replace(' -> ', '_')}_validator.py"
-            ))
-        
+        # Copie superficielle : les issues sont immuables et partagées
+        self.issues = list(_DATA_FLOW_ISSUES)
         return self.issues
     
     def generate_mitigation_plan(self) -> Dict[str, Any]:
@@ -1,5 +1,6 @@
 # core/config.py
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List, Optional
 
@@ -20,6 +21,9 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: str
+    # Pool HTTP/2 keep-alive partagé par les requêtes PostgREST d'un client
+    SUPABASE_MAX_CONNECTIONS: int = 120
+    SUPABASE_MAX_KEEPALIVE: int = 80
     
     # OpenAI
     OPENAI_API_KEY: str
@@ -46,6 +50,17 @@ class Settings(BaseSettings):
     # Redis / WebSockets cache (local or cloud)
     REDIS_URL: str = "redis://localhost:6379"
 
+    # Celery (tâches longues PINN / optimisation)
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/1"
+    CELERY_WORKER_CONCURRENCY: int = 8
+    CELERY_BROKER_POOL_LIMIT: int = 50
+    # Tâches PINN / optimisation de l'orchestrateur envoyées aux workers
+    # Celery (files pinn et opt) ; sinon exécution simulée
+    CELERY_ORCHESTRATOR_TASKS: bool = False
+    # Latence factice des tâches simulées (dev local uniquement, avec DEBUG)
+    SIMULATE_TASK_LATENCY: bool = False
+
     # UPSTASH REDIS (⚠️ Ajout obligatoire pour corriger ton erreur)
     UPSTASH_REDIS_REST_URL: Optional[str] = None
     UPSTASH_REDIS_REST_TOKEN: Optional[str] = None
@@ -68,5 +83,7 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache
 def get_settings():
+    # Lecture de l'environnement et validation pydantic une seule fois par processus
     return Settings()
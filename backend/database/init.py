@@ -14,6 +14,7 @@ from .repositories import (
     CodeAnalysisRepository,
     DigitalTwinRepository,
     UsageMetricsRepository,
+    TokenRevocationRepository,
     RepositoryFactory
 )
 from .migrations import DatabaseMigrator, run_database_migrations
@@ -28,6 +29,7 @@ __all__ = [
     "CodeAnalysisRepository",
     "DigitalTwinRepository", 
     "UsageMetricsRepository",
+    "TokenRevocationRepository",
     "RepositoryFactory",
     "DatabaseMigrator",
     "run_database_migrations"
@@ -73,3 +73,9 @@ def run_database_migrations():
     client = SupabaseClient.get_admin_client()
     migrator = DatabaseMigrator(client)
     migrator.run_migrations()
+
+
+# Exécuté hors de l'API (CI/CD, pre-deploy hook) pour ne jamais migrer
+# au démarrage de chaque réplique : `python -m database.migrations`
+if __name__ == "__main__":
+    run_database_migrations()
@@ -1,27 +1,190 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+from dataclasses import fields
+from datetime import datetime, timezone
+from functools import cached_property, wraps
+from typing import AsyncIterator, List, Optional, Dict, Any
+import msgpack
+import orjson
 from supabase import Client
 from models.domain_models import User, Organization, Team, PhysicsModel, Simulation, CodeAnalysis, DigitalTwin, UsageMetrics
-from models.pydantic_models import PhysicsModelCreate, SimulationCreate, DigitalTwinCreate, UserCreate
+from models.pydantic_models import PhysicsModelCreate, SimulationCreate, DigitalTwinCreate, UserCreate, SimulationStatus, UserRole
 from core.exceptions import ResourceNotFoundError, AuthenticationError
 from utils.logger import database_logger
+from utils.cache import cache_hget, cache_hset, cache_delete
+
+def _columns(model) -> str:
+    # Colonnes explicites = champs du modèle de domaine : PostgREST ne
+    # sérialise pas les colonnes que l'on n'utilise pas
+    return ",".join(field.name for field in fields(model))
+
+_USER_COLUMNS = _columns(User)
+_ORGANIZATION_COLUMNS = _columns(Organization)
+_PHYSICS_MODEL_COLUMNS = _columns(PhysicsModel)
+_SIMULATION_COLUMNS = _columns(Simulation)
+_DIGITAL_TWIN_COLUMNS = _columns(DigitalTwin)
+
+# Taille de page par défaut des listes par équipe
+DEFAULT_PAGE_SIZE = 100
+# Ordre total des pages par équipe (id départage les created_at égaux, sinon
+# limit/offset peut sauter ou répéter des lignes). Une seule valeur "order" :
+# postgrest-py ajouterait un second paramètre au lieu de compléter le premier.
+_TEAM_PAGE_ORDER = "created_at.desc,id"
+
+# Listes par équipe relues à chaque rafraîchissement de tableau de bord :
+# mises en cache Redis (une entrée hash par table et équipe, un champ par
+# page) et invalidées à chaque écriture de la table pour cette équipe
+TEAM_CACHE_TTL = 30
+
+def _team_cached(fetch_rows):
+    """Met en cache les lignes brutes (msgpack) renvoyées par `fetch_rows`"""
+    @wraps(fetch_rows)
+    async def wrapper(self, team_id: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        key = self._team_cache_key(team_id)
+        field = f"{offset}:{limit}"
+        cached = await cache_hget(key, field)
+        if cached is not None:
+            return msgpack.unpackb(cached)
+
+        rows = await fetch_rows(self, team_id, limit, offset)
+        await cache_hset(key, field, msgpack.packb(rows), TEAM_CACHE_TTL)
+        return rows
+    return wrapper
+
+async def _execute(query):
+    # Le client PostgREST est synchrone : l'aller-retour HTTP part dans un
+    # thread pour ne pas bloquer la boucle d'événements
+    return await asyncio.to_thread(query.execute)
+
+# Résultats PINN (tableaux NumPy float32 de la taille du maillage) : orjson
+# les encode en C via son chemin NumPy, puis on repasse en types JSON natifs
+# que le client PostgREST (json standard) sait envoyer
+_NUMPY_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _json_native(data: Dict[str, Any]) -> Dict[str, Any]:
+    return orjson.loads(orjson.dumps(data, option=_NUMPY_JSON_OPTIONS))
 
 class BaseRepository:
     def __init__(self, client: Client, table_name: str):
         self.client = client
         self.table_name = table_name
+    
+    def _team_cache_key(self, team_id: str) -> str:
+        return f"{self.table_name}:team:{team_id}"
+    
+    async def invalidate_team(self, team_id: str) -> None:
+        await cache_delete(self._team_cache_key(team_id))
+
+class InsertBatcher:
+    """
+    Regroupe les insertions d'une table : les lignes soumises dans une même
+    fenêtre (max_batch lignes ou max_delay secondes) partent en un seul
+    INSERT multi-lignes. Chaque soumission reçoit un future résolu avec la
+    ligne insérée. Un INSERT multi-lignes est atomique : si le lot échoue,
+    ses lignes sont réinsérées une à une pour que chaque future ne porte
+    que sa propre erreur.
+    """
+
+    def __init__(self, client: Client, table_name: str, max_batch: int = 50,
+                 max_delay: float = 0.1, max_pending: int = 1000):
+        self.client = client
+        self.table_name = table_name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def submit(self, row: Dict[str, Any]) -> asyncio.Future:
+        """Met la ligne en file ; lève asyncio.QueueFull si la file est pleine"""
+        loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((row, future))
+        return future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+
+            try:
+                # wait_for peut absorber l'annulation quand get() aboutit au
+                # même moment : aclose lève aussi _closing pour ne pas attendre
+                # la fin de la fenêtre
+                while len(batch) < self.max_batch and not self._closing:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Arrêt pendant la constitution du lot : ne pas le perdre
+                await self._flush(batch)
+                raise
+
+            await self._flush(batch)
+            if self._closing:
+                return
+
+    async def _flush(self, batch):
+        try:
+            response = await _execute(self.client.table(self.table_name).insert([row for row, _ in batch]))
+            if len(response.data or []) != len(batch):
+                raise ResourceNotFoundError(f"Failed to insert into {self.table_name}")
+            for (_, future), row in zip(batch, response.data):
+                if not future.done():
+                    future.set_result(row)
+        except Exception as e:
+            if len(batch) > 1:
+                database_logger.warning("Batched insert into %s failed (%s rows), retrying row by row: %s", self.table_name, len(batch), e)
+                await asyncio.gather(*(self._flush([item]) for item in batch if not item[1].done()))
+                return
+            database_logger.error("Insert into %s failed: %s", self.table_name, e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def aclose(self):
+        """Arrête la tâche de fond et insère ce qui reste en file"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._flush(pending)
+        self._queue = None
+        self._task = None
+        self._closing = False
 
 class UserRepository(BaseRepository):
     def __init__(self, client: Client):
         super().__init__(client, "profiles")
     
+    # Tous les champs de User sont des colonnes de `profiles` : une seule
+    # requête d'au plus une ligne suffit, sans chargement secondaire
     async def get_by_id(self, user_id: str) -> Optional[User]:
-        response = self.client.table(self.table_name).select("*").eq("id", user_id).execute()
+        response = await _execute(self.client.table(self.table_name).select(_USER_COLUMNS).eq("id", user_id).limit(1))
         if response.data:
             return User(**response.data[0])
         return None
     
     async def get_by_email(self, email: str) -> Optional[User]:
-        response = self.client.table(self.table_name).select("*").eq("email", email).execute()
+        response = await _execute(self.client.table(self.table_name).select(_USER_COLUMNS).eq("email", email).limit(1))
         if response.data:
             return User(**response.data[0])
         return None
@@ -31,18 +194,18 @@ class UserRepository(BaseRepository):
             "id": user_id,
             "email": user_data.email,
             "full_name": user_data.full_name,
-            "role": "engineer",
+            "role": UserRole.ENGINEER.value,
             "expertise_area": user_data.expertise_area or {}
         }
         
-        response = self.client.table(self.table_name).insert(data).execute()
+        response = await _execute(self.client.table(self.table_name).insert(data))
         if response.data:
-            database_logger.info(f"User created: {user_data.email}")
+            database_logger.info("User created: %s", user_data.email)
             return User(**response.data[0])
         raise AuthenticationError("Failed to create user profile")
     
     async def update(self, user_id: str, update_data: Dict[str, Any]) -> User:
-        response = self.client.table(self.table_name).update(update_data).eq("id", user_id).execute()
+        response = await _execute(self.client.table(self.table_name).update(update_data).eq("id", user_id))
         if response.data:
             return User(**response.data[0])
         raise ResourceNotFoundError("User not found")
@@ -52,13 +215,13 @@ class OrganizationRepository(BaseRepository):
         super().__init__(client, "organizations")
     
     async def create(self, org_data: Dict[str, Any]) -> Organization:
-        response = self.client.table(self.table_name).insert(org_data).execute()
+        response = await _execute(self.client.table(self.table_name).insert(org_data))
         if response.data:
             return Organization(**response.data[0])
         raise ResourceNotFoundError("Failed to create organization")
     
     async def get_by_id(self, org_id: str) -> Optional[Organization]:
-        response = self.client.table(self.table_name).select("*").eq("id", org_id).execute()
+        response = await _execute(self.client.table(self.table_name).select(_ORGANIZATION_COLUMNS).eq("id", org_id))
         if response.data:
             return Organization(**response.data[0])
         return None
@@ -69,24 +232,30 @@ class PhysicsModelRepository(BaseRepository):
     
     async def create(self, model_data: PhysicsModelCreate, team_id: str) -> PhysicsModel:
         data = {
-            **model_data.dict(),
+            **model_data.model_dump(mode="json", exclude_unset=True),
             "team_id": team_id
         }
-        response = self.client.table(self.table_name).insert(data).execute()
+        response = await _execute(self.client.table(self.table_name).insert(data))
         if response.data:
-            database_logger.info(f"Physics model created: {model_data.name}")
+            await self.invalidate_team(team_id)
+            database_logger.info("Physics model created: %s", model_data.name)
             return PhysicsModel(**response.data[0])
         raise ResourceNotFoundError("Failed to create physics model")
     
     async def get_by_id(self, model_id: str) -> Optional[PhysicsModel]:
-        response = self.client.table(self.table_name).select("*").eq("id", model_id).execute()
+        response = await _execute(self.client.table(self.table_name).select(_PHYSICS_MODEL_COLUMNS).eq("id", model_id))
         if response.data:
             return PhysicsModel(**response.data[0])
         return None
     
-    async def get_by_team(self, team_id: str) -> List[PhysicsModel]:
-        response = self.client.table(self.table_name).select("*").eq("team_id", team_id).execute()
-        return [PhysicsModel(**item) for item in response.data]
+    async def get_by_team(self, team_id: str, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> List[PhysicsModel]:
+        rows = await self._team_rows(team_id, limit, offset)
+        return [PhysicsModel(**item) for item in rows]
+    
+    @_team_cached
+    async def _team_rows(self, team_id: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        response = await _execute(self.client.table(self.table_name).select(_PHYSICS_MODEL_COLUMNS).eq("team_id", team_id).order(_TEAM_PAGE_ORDER).range(offset, offset + limit - 1))
+        return response.data
 
 class SimulationRepository(BaseRepository):
     def __init__(self, client: Client):
@@ -94,49 +263,75 @@ class SimulationRepository(BaseRepository):
     
     async def create(self, simulation_data: SimulationCreate, team_id: str) -> Simulation:
         data = {
-            **simulation_data.dict(),
+            **simulation_data.model_dump(mode="json", exclude_unset=True),
             "team_id": team_id,
-            "status": "pending"
+            "status": SimulationStatus.PENDING.value
         }
-        response = self.client.table(self.table_name).insert(data).execute()
+        response = await _execute(self.client.table(self.table_name).insert(data))
         if response.data:
-            database_logger.info(f"Simulation created: {simulation_data.name}")
+            await self.invalidate_team(team_id)
+            database_logger.info("Simulation created: %s", simulation_data.name)
             return Simulation(**response.data[0])
         raise ResourceNotFoundError("Failed to create simulation")
     
     async def get_by_id(self, simulation_id: str) -> Optional[Simulation]:
-        response = self.client.table(self.table_name).select("*").eq("id", simulation_id).execute()
+        response = await _execute(self.client.table(self.table_name).select(_SIMULATION_COLUMNS).eq("id", simulation_id))
         if response.data:
             return Simulation(**response.data[0])
         return None
     
-    async def get_by_team(self, team_id: str) -> List[Simulation]:
-        response = self.client.table(self.table_name).select("*").eq("team_id", team_id).order("created_at", desc=True).execute()
-        return [Simulation(**item) for item in response.data]
+    async def get_by_team(self, team_id: str, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> List[Simulation]:
+        rows = await self._team_rows(team_id, limit, offset)
+        return [Simulation(**item) for item in rows]
+    
+    @_team_cached
+    async def _team_rows(self, team_id: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        response = await _execute(self.client.table(self.table_name).select(_SIMULATION_COLUMNS).eq("team_id", team_id).order(_TEAM_PAGE_ORDER).range(offset, offset + limit - 1))
+        return response.data
+    
+    async def iter_by_team(self, team_id: str, page_size: int = 500) -> AsyncIterator[Simulation]:
+        # PostgREST n'expose pas de curseur : on parcourt par pages `range`
+        # pour ne garder qu'une page en mémoire à la fois
+        start = 0
+        while True:
+            response = await _execute(
+                self.client.table(self.table_name)
+                .select(_SIMULATION_COLUMNS)
+                .eq("team_id", team_id)
+                .order(_TEAM_PAGE_ORDER)
+                .range(start, start + page_size - 1)
+            )
+            for item in response.data:
+                yield Simulation(**item)
+            if len(response.data) < page_size:
+                return
+            start += page_size
     
-    async def update_status(self, simulation_id: str, status: str, results: Dict[str, Any] = None):
-        update_data = {"status": status}
+    async def update_status(self, simulation_id: str, status: SimulationStatus, results: Dict[str, Any] = None):
+        update_data = {"status": SimulationStatus(status).value}
         if results:
-            update_data.update(results)
+            update_data.update(_json_native(results))
         
-        response = self.client.table(self.table_name).update(update_data).eq("id", simulation_id).execute()
+        response = await _execute(self.client.table(self.table_name).update(update_data).eq("id", simulation_id))
         if not response.data:
             raise ResourceNotFoundError(f"Simulation {simulation_id} not found")
+        await self.invalidate_team(response.data[0]["team_id"])
 
 class CodeAnalysisRepository(BaseRepository):
     def __init__(self, client: Client):
         super().__init__(client, "code_analysis")
+        self._batcher = InsertBatcher(client, self.table_name)
     
-    async def save_analysis(self, session_id: str, analysis_data: Dict[str, Any]) -> CodeAnalysis:
-        data = {
+    def submit_analysis(self, session_id: str, analysis_data: Dict[str, Any]) -> asyncio.Future:
+        # Sans attendre l'écriture : le future se résout au prochain lot
+        return self._batcher.submit({
             "session_id": session_id,
             **analysis_data
-        }
-        response = self.client.table(self.table_name).insert(data).execute()
-        
-        if response.data:
-            return CodeAnalysis(**response.data[0])
-        raise ResourceNotFoundError("Failed to save code analysis")
+        })
+    
+    async def save_analysis(self, session_id: str, analysis_data: Dict[str, Any]) -> CodeAnalysis:
+        row = await self.submit_analysis(session_id, analysis_data)
+        return CodeAnalysis(**row)
 
 class DigitalTwinRepository(BaseRepository):
     def __init__(self, client: Client):
@@ -144,64 +339,113 @@ class DigitalTwinRepository(BaseRepository):
     
     async def create(self, twin_data: DigitalTwinCreate, team_id: str) -> DigitalTwin:
         data = {
-            **twin_data.dict(),
+            **twin_data.model_dump(mode="json", exclude_unset=True),
             "team_id": team_id,
             "surrogate_model_config": {},
             "current_performance_metrics": {}
         }
-        response = self.client.table(self.table_name).insert(data).execute()
+        response = await _execute(self.client.table(self.table_name).insert(data))
         if response.data:
-            database_logger.info(f"Digital twin created: {twin_data.name}")
+            await self.invalidate_team(team_id)
+            database_logger.info("Digital twin created: %s", twin_data.name)
             return DigitalTwin(**response.data[0])
         raise ResourceNotFoundError("Failed to create digital twin")
     
-    async def get_by_team(self, team_id: str) -> List[DigitalTwin]:
-        response = self.client.table(self.table_name).select("*").eq("team_id", team_id).execute()
-        return [DigitalTwin(**item) for item in response.data]
+    async def get_by_team(self, team_id: str, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> List[DigitalTwin]:
+        rows = await self._team_rows(team_id, limit, offset)
+        return [DigitalTwin(**item) for item in rows]
+    
+    @_team_cached
+    async def _team_rows(self, team_id: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        response = await _execute(self.client.table(self.table_name).select(_DIGITAL_TWIN_COLUMNS).eq("team_id", team_id).order(_TEAM_PAGE_ORDER).range(offset, offset + limit - 1))
+        return response.data
 
 class UsageMetricsRepository(BaseRepository):
     def __init__(self, client: Client):
         super().__init__(client, "usage_metrics")
+        self._batcher = InsertBatcher(client, self.table_name)
     
     async def record_usage(self, org_id: str, metrics: Dict[str, Any]) -> UsageMetrics:
-        data = {
+        # Les enregistrements concurrents partagent un seul INSERT
+        row = await self._batcher.submit({
             "org_id": org_id,
             **metrics
-        }
-        response = self.client.table(self.table_name).insert(data).execute()
-        if response.data:
-            return UsageMetrics(**response.data[0])
-        raise ResourceNotFoundError("Failed to record usage metrics")
+        })
+        return UsageMetrics(**row)
+
+class TokenRevocationRepository(BaseRepository):
+    def __init__(self, client: Client):
+        super().__init__(client, "token_revocations")
+    
+    async def get_since(self, since: datetime) -> List[Dict[str, Any]]:
+        """Révocations survenues depuis `since` (les plus anciennes ne visent que des tokens expirés)"""
+        response = await _execute(
+            self.client.table(self.table_name)
+            .select("user_id, revoked_at")
+            .gte("revoked_at", since.isoformat())
+        )
+        return response.data or []
+    
+    async def delete_before(self, before: datetime) -> None:
+        """Supprime les révocations antérieures à `before`"""
+        await _execute(
+            self.client.table(self.table_name)
+            .delete()
+            .lt("revoked_at", before.isoformat())
+        )
+    
+    async def revoke_user(self, user_id: str) -> datetime:
+        revoked_at = datetime.now(timezone.utc)
+        response = await _execute(self.client.table(self.table_name).upsert(
+            {"user_id": user_id, "revoked_at": revoked_at.isoformat()}
+        ))
+        if not response.data:
+            raise ResourceNotFoundError("Failed to revoke user tokens")
+        database_logger.info("Tokens revoked for user: %s", user_id)
+        return revoked_at
 
 # Repository Factory
+# Les repositories sont sans état (ils n'enveloppent que le client) :
+# chacun est construit une seule fois par factory.
 class RepositoryFactory:
     def __init__(self, client: Client):
         self.client = client
     
-    @property
+    @cached_property
     def users(self) -> UserRepository:
         return UserRepository(self.client)
     
-    @property
+    @cached_property
     def organizations(self) -> OrganizationRepository:
         return OrganizationRepository(self.client)
     
-    @property
+    @cached_property
     def physics_models(self) -> PhysicsModelRepository:
         return PhysicsModelRepository(self.client)
     
-    @property
+    @cached_property
     def simulations(self) -> SimulationRepository:
         return SimulationRepository(self.client)
     
-    @property
+    @cached_property
     def code_analysis(self) -> CodeAnalysisRepository:
         return CodeAnalysisRepository(self.client)
     
-    @property
+    @cached_property
     def digital_twins(self) -> DigitalTwinRepository:
         return DigitalTwinRepository(self.client)
     
-    @property
+    @cached_property
     def usage_metrics(self) -> UsageMetricsRepository:
         return UsageMetricsRepository(self.client)
+    
+    @cached_property
+    def token_revocations(self) -> TokenRevocationRepository:
+        return TokenRevocationRepository(self.client)
+    
+    async def aclose(self):
+        """Vide les insertions en attente des repositories déjà instanciés"""
+        for name in ("code_analysis", "usage_metrics"):
+            repository = self.__dict__.get(name)
+            if repository is not None:
+                await repository._batcher.aclose()
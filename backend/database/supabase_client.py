@@ -1,5 +1,8 @@
 # app/database/supabase_client.py
 
+import threading
+
+import httpx
 from supabase import create_client, Client
 from core.config import get_settings
 from utils.logger import database_logger
@@ -7,58 +10,106 @@ from utils.logger import database_logger
 class SupabaseClient:
     _instance: Client | None = None
     _admin_instance: Client | None = None
+    # Un seul client par processus même si plusieurs threads (threadpool
+    # FastAPI, to_thread) le demandent simultanément au démarrage
+    _lock = threading.Lock()
 
     @staticmethod
     def _create_client(url: str, key: str) -> Client:
         """Create a Supabase client with safe error handling."""
+        # Pas de requête de test ici : la connectivité est vérifiée par
+        # healthcheck() (GET /health/db), pas au premier appel métier
         try:
             client = create_client(url, key)
-
-            # Quick connection test (non-blocking)
-            client.table("profiles").select("*").limit(1).execute()
-
+            SupabaseClient._use_pooled_session(client)
             return client
         except Exception as e:
-            database_logger.error(f"Supabase client creation failed: {e}")
+            database_logger.error("Supabase client creation failed: %s", e)
             raise
 
+    @staticmethod
+    def _use_pooled_session(client: Client) -> None:
+        """
+        Remplace la session httpx de PostgREST par une session HTTP/2 au
+        pool keep-alive borné (mêmes base_url et en-têtes d'authentification)
+        """
+        settings = get_settings()
+        default_session = client.postgrest.session
+        client.postgrest.session = httpx.Client(
+            base_url=default_session.base_url,
+            headers=default_session.headers,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_MAX_KEEPALIVE,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(30.0, connect=2.0),
+        )
+        default_session.close()
+
+    @classmethod
+    def close(cls) -> None:
+        """Ferme les pools de connexions des clients créés (arrêt de l'API)."""
+        for client in (cls._instance, cls._admin_instance):
+            if client is not None:
+                client.postgrest.session.close()
+
+    @classmethod
+    def healthcheck(cls) -> bool:
+        """Round-trip minimal vers PostgREST avec le client admin (bloquant)."""
+        try:
+            cls.get_admin_client().table("profiles").select("id").limit(1).execute()
+            return True
+        except Exception as e:
+            database_logger.error("Supabase healthcheck failed: %s", e)
+            return False
+
     @classmethod
     def get_client(cls) -> Client:
         """Lazy-loaded public client (anon key)."""
-        if cls._instance is None:
-            settings = get_settings()
+        if cls._instance is not None:
+            return cls._instance
+
+        with cls._lock:
+            if cls._instance is None:
+                settings = get_settings()
 
-            if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-                database_logger.error("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
-                raise ValueError("Supabase environment variables not set")
+                if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+                    database_logger.error("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
+                    raise ValueError("Supabase environment variables not set")
 
-            database_logger.info("Initializing Supabase public client…")
-            cls._instance = cls._create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_KEY
-            )
+                database_logger.info("Initializing Supabase public client…")
+                cls._instance = cls._create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_KEY
+                )
 
-            database_logger.info("Supabase public client initialized successfully")
+                database_logger.info("Supabase public client initialized successfully")
 
         return cls._instance
 
     @classmethod
     def get_admin_client(cls) -> Client:
         """Lazy-loaded admin client (service_role key)."""
-        if cls._admin_instance is None:
-            settings = get_settings()
+        if cls._admin_instance is not None:
+            return cls._admin_instance
+
+        with cls._lock:
+            if cls._admin_instance is None:
+                settings = get_settings()
 
-            if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
-                database_logger.error("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY environment variables")
-                raise ValueError("Admin Supabase environment variables not set")
+                if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
+                    database_logger.error("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY environment variables")
+                    raise ValueError("Admin Supabase environment variables not set")
 
-            database_logger.info("Initializing Supabase admin client…")
-            cls._admin_instance = cls._create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_SERVICE_KEY
-            )
+                database_logger.info("Initializing Supabase admin client…")
+                cls._admin_instance = cls._create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_SERVICE_KEY
+                )
 
-            database_logger.info("Supabase admin client initialized successfully")
+                database_logger.info("Supabase admin client initialized successfully")
 
         return cls._admin_instance
 
@@ -1,258 +1,378 @@
 # /backend/deployment/horizontal_scaling_manager.py
 import asyncio
-from typing import Dict, List, Any
-import docker
+import copy
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
 from kubernetes import client, config
 
+# Specs docker-compose fixes, construites une fois à l'import
+_BACKEND_DEPLOY = {
+    'mode': 'replicated',
+    'replicas': 5,
+    'resources': {
+        'limits': {
+            'cpus': '2.0',
+            'memory': '8G'
+        },
+        'reservations': {
+            'cpus': '1.0', 
+            'memory': '4G'
+        }
+    },
+    'restart_policy': {
+        'condition': 'on-failure',
+        'delay': '5s',
+        'max_attempts': 3
+    }
+}
+
+# Configuration pour les simulations PINN
+_PINN_WORKER_SPEC = {
+    'image': 'rd-accelerator-pinn-worker:latest',
+    'deploy': {
+        'mode': 'replicated',
+        'replicas': 10,
+        'resources': {
+            'limits': {
+                'cpus': '4.0',
+                'memory': '16G',
+                'devices': [
+                    {
+                        'capabilities': ['gpu'],
+                        'driver': 'nvidia',
+                        'count': 1
+                    }
+                ]
+            }
+        }
+    },
+    'environment': [
+        'NVIDIA_VISIBLE_DEVICES=all',
+        'CUDA_VISIBLE_DEVICES=0'
+    ]
+}
+
+# Load balancer
+_TRAEFIK_SPEC = {
+    'image': 'traefik:v2.9',
+    'command': [
+        '--api.dashboard=true',
+        '--providers.docker=true',
+        '--entrypoints.web.address=:80'
+    ],
+    'ports': ['80:80', '8080:8080'],
+    'volumes': ['/var/run/docker.sock:/var/run/docker.sock']
+}
+
+# Plans typés renvoyés par le gestionnaire ; orjson sérialise directement les
+# dataclasses (orjson.dumps(plan)), sans passer par des dicts intermédiaires
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ComputeRequirements:
+    gpu_nodes: int
+    cpu_nodes: int
+    memory_total_gb: int
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class StorageRequirements:
+    hot_storage_gb: int
+    warm_storage_tb: float
+    cold_storage_tb: float
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class NetworkRequirements:
+    bandwidth_gbps: int
+    latency_requirement: str
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class InfrastructureRequirements:
+    compute_requirements: ComputeRequirements
+    storage_requirements: StorageRequirements
+    network_requirements: NetworkRequirements
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class CapacityAnalysis:
+    current_simulations: int
+    target_simulations: int
+    capacity_gap: int
+    scaling_factor: float
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class AutoScaling:
+    min_replicas: int
+    max_replicas: int
+    metrics: Tuple[str, ...]
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ResourceManagement:
+    resource_quotas: str
+    priority_classes: str
+    preemption: str
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DeploymentStrategy:
+    orchestrator: str
+    auto_scaling: AutoScaling
+    resource_management: ResourceManagement
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class AlertingThresholds:
+    high_gpu_wait_time: str
+    low_success_rate: str
+    high_memory_usage: str
+    api_timeout: str
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class LoggingRequirements:
+    level: str
+    retention: str
+    aggregation: str
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class MonitoringRequirements:
+    metrics_to_track: Tuple[str, ...]
+    alerting_thresholds: AlertingThresholds
+    logging_requirements: LoggingRequirements
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ScalingPlan:
+    current_limitations: List[str]
+    infrastructure_requirements: InfrastructureRequirements
+    deployment_strategy: DeploymentStrategy
+    monitoring_requirements: MonitoringRequirements
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class StorageTier:
+    technology: str
+    capacity: str
+    purpose: str
+    performance: str
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class TieredStorage:
+    hot_storage: StorageTier
+    warm_storage: StorageTier
+    cold_storage: StorageTier
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DataLifecycle:
+    immediate: str
+    recent: str
+    archive: str
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class StorageStrategy:
+    tiered_storage: TieredStorage
+    data_lifecycle: DataLifecycle
+    optimization_strategies: Tuple[str, ...]
+
+# Stratégie de stockage fixe et entièrement immuable : partagée entre appels
+_STORAGE_STRATEGY = StorageStrategy(
+    tiered_storage=TieredStorage(
+        hot_storage=StorageTier(
+            technology='Redis Cluster',
+            capacity='64GB',
+            purpose='Données de simulation actives et cache',
+            performance='µs latency'
+        ),
+        warm_storage=StorageTier(
+            technology='SSD NVMe Storage',
+            capacity='2TB', 
+            purpose='Résultats de simulation récents',
+            performance='ms latency'
+        ),
+        cold_storage=StorageTier(
+            technology='Object Storage (S3 compatible)',
+            capacity='10TB+',
+            purpose='Archive des simulations et datasets',
+            performance='seconds latency'
+        )
+    ),
+    data_lifecycle=DataLifecycle(
+        immediate='Redis (7 days)',
+        recent='SSD (30 days)', 
+        archive='Object Storage (indefinite)'
+    ),
+    optimization_strategies=(
+        'Compression LZ4 pour les résultats numériques',
+        'Dédoublonation des maillages similaires',
+        'Streaming pour l\'accès aux gros datasets'
+    )
+)
+
+# Goulots d'étranglement constatés au-delà de 50 simulations simultanées
+_HIGH_LOAD_BOTTLENECKS = (
+    "Base de données: connexions simultanées limitées",
+    "Ressources GPU: allocation compétitive",
+    "Réseau: bande passante pour les gros datasets"
+)
+
+# Gabarits de code des stratégies distribuées (deployment/templates/*.py.tmpl)
+_TEMPLATES_DIR = Path(__file__).parent / 'templates'
+
+_DISTRIBUTED_STRATEGY = {
+    'data_parallelism': {
+        'technique': 'DistributedDataParallel (PyTorch)',
+        'template_name': 'data_parallel',
+        'scaling': 'Linéaire avec le nombre de GPUs'
+    },
+    'model_parallelism': {
+        'technique': 'Pipeline Parallelism', 
+        'template_name': 'model_parallel',
+        'use_case': 'Réseaux très profonds (>1000 layers)'
+    },
+    'hybrid_approach': {
+        'technique': 'Data + Model Parallelism',
+        'template_name': 'hybrid',
+        'benefit': 'Optimisation pour clusters hétérogènes'
+    }
+}
+
+_STRATEGY_TEMPLATES = frozenset(
+    strategy['template_name'] for strategy in _DISTRIBUTED_STRATEGY.values()
+)
+
+@lru_cache(maxsize=None)
+def _load_strategy_template(template_name: str) -> str:
+    # Lu une seule fois par gabarit ; le nom est contrôlé pour ne jamais
+    # sortir du dossier des gabarits
+    if template_name not in _STRATEGY_TEMPLATES:
+        raise KeyError(f"Unknown distributed training template: {template_name}")
+    return (_TEMPLATES_DIR / f'{template_name}.py.tmpl').read_text(encoding='utf-8')
+
 class HorizontalScalingManager:
     """Gestionnaire du scale horizontal pour supporter 100+ simulations simultanées"""
     
-    def __init__(self):
-        self.docker_client = docker.from_env()
+    # Pas d'__init__ : les méthodes de planification n'ont pas besoin du démon
+    # Docker, la connexion n'est ouverte qu'au premier accès à docker_client
+    @cached_property
+    def docker_client(self):
+        import docker
+        return docker.from_env()
     
-    async def generate_scaling_plan(self, current_capacity: int, target_capacity: int) -> Dict[str, Any]:
+    async def generate_scaling_plan(self, current_capacity: int, target_capacity: int) -> ScalingPlan:
         """Génère un plan de scaling pour supporter la charge cible"""
         
         capacity_analysis = self._analyze_capacity_gap(current_capacity, target_capacity)
         
-        scaling_plan = {
-            'current_limitations': self._identify_bottlenecks(current_capacity),
-            'infrastructure_requirements': self._calculate_infrastructure_requirements(target_capacity),
-            'deployment_strategy': self._generate_deployment_strategy(target_capacity),
-            'monitoring_requirements': self._define_monitoring_requirements(target_capacity)
-        }
-        
-        return scaling_plan
+        return ScalingPlan(
+            current_limitations=self._identify_bottlenecks(current_capacity),
+            infrastructure_requirements=self._calculate_infrastructure_requirements(target_capacity),
+            deployment_strategy=self._generate_deployment_strategy(target_capacity),
+            monitoring_requirements=self._define_monitoring_requirements(target_capacity)
+        )
     
     def optimize_docker_compose(self, base_compose: Dict[str, Any]) -> Dict[str, Any]:
         """Optimise docker-compose.yml pour le scale horizontal"""
         
-        optimized_compose = base_compose.copy()
+        # Copie profonde : le compose de l'appelant (et son dict 'services')
+        # n'est jamais modifié, et les specs module ne sont pas partagées
+        optimized_compose = copy.deepcopy(base_compose)
+        services = optimized_compose['services']
         
         # Scaling des services backend
-        optimized_compose['services']['backend']['deploy'] = {
-            'mode': 'replicated',
-            'replicas': 5,
-            'resources': {
-                'limits': {
-                    'cpus': '2.0',
-                    'memory': '8G'
-                },
-                'reservations': {
-                    'cpus': '1.0', 
-                    'memory': '4G'
-                }
-            },
-            'restart_policy': {
-                'condition': 'on-failure',
-                'delay': '5s',
-                'max_attempts': 3
-            }
-        }
-        
-        # Configuration pour les simulations PINN
-        optimized_compose['services']['pinn_worker'] = {
-            'image': 'rd-accelerator-pinn-worker:latest',
-            'deploy': {
-                'mode': 'replicated',
-                'replicas': 10,
-                'resources': {
-                    'limits': {
-                        'cpus': '4.0',
-                        'memory': '16G',
-                        'devices': [
-                            {
-                                'capabilities': ['gpu'],
-                                'driver': 'nvidia',
-                                'count': 1
-                            }
-                        ]
-                    }
-                }
-            },
-            'environment': [
-                'NVIDIA_VISIBLE_DEVICES=all',
-                'CUDA_VISIBLE_DEVICES=0'
-            ]
-        }
+        services['backend']['deploy'] = copy.deepcopy(_BACKEND_DEPLOY)
         
-        # Load balancer
-        optimized_compose['services']['traefik'] = {
-            'image': 'traefik:v2.9',
-            'command': [
-                '--api.dashboard=true',
-                '--providers.docker=true',
-                '--entrypoints.web.address=:80'
-            ],
-            'ports': ['80:80', '8080:8080'],
-            'volumes': ['/var/run/docker.sock:/var/run/docker.sock']
-        }
+        # Workers PINN (GPU) et load balancer
+        services['pinn_worker'] = copy.deepcopy(_PINN_WORKER_SPEC)
+        services['traefik'] = copy.deepcopy(_TRAEFIK_SPEC)
         
         return optimized_compose
     
-    def design_data_storage_strategy(self, data_requirements: Dict[str, Any]) -> Dict[str, Any]:
+    def design_data_storage_strategy(self, data_requirements: Dict[str, Any]) -> StorageStrategy:
         """Conçoit la stratégie de stockage pour les gros volumes de données"""
-        
-        storage_strategy = {
-            'tiered_storage': {
-                'hot_storage': {
-                    'technology': 'Redis Cluster',
-                    'capacity': '64GB',
-                    'purpose': 'Données de simulation actives et cache',
-                    'performance': 'µs latency'
-                },
-                'warm_storage': {
-                    'technology': 'SSD NVMe Storage',
-                    'capacity': '2TB', 
-                    'purpose': 'Résultats de simulation récents',
-                    'performance': 'ms latency'
-                },
-                'cold_storage': {
-                    'technology': 'Object Storage (S3 compatible)',
-                    'capacity': '10TB+',
-                    'purpose': 'Archive des simulations et datasets',
-                    'performance': 'seconds latency'
-                }
-            },
-            'data_lifecycle': {
-                'immediate': 'Redis (7 days)',
-                'recent': 'SSD (30 days)', 
-                'archive': 'Object Storage (indefinite)'
-            },
-            'optimization_strategies': [
-                'Compression LZ4 pour les résultats numériques',
-                'Dédoublonation des maillages similaires',
-                'Streaming pour l\'accès aux gros datasets'
-            ]
-        }
-        
-        return storage_strategy
+        return _STORAGE_STRATEGY
     
     def implement_distributed_training(self, training_config: Dict[str, Any]) -> Dict[str, Any]:
         """Implémente l'entraînement distribué sur multiples GPUs"""
-        
-        distributed_strategy = {
-            'data_parallelism': {
-                'technique': 'DistributedDataParallel (PyTorch)',
-                'implementation': '''
-                # training_manager.py
-                import torch.distributed as dist
-                from torch.nn.parallel import DistributedDataParallel as DDP
-                
-                def setup_distributed():
-                    dist.init_process_group(backend='nccl')
-                    local_rank = int(os.environ["LOCAL_RANK"])
-                    torch.cuda.set_device(local_rank)
-                
-                def create_distributed_model(model):
-                    return DDP(model, device_ids=[local_rank])
-                ''',
-                'scaling': 'Linéaire avec le nombre de GPUs'
-            },
-            'model_parallelism': {
-                'technique': 'Pipeline Parallelism', 
-                'implementation': '''
-                # Pour très gros modèles PINN
-                from torch.distributed.pipeline.sync import Pipe
-                
-                model = nn.Sequential(
-                    layer1, layer2, layer3, layer4
-                )
-                model = Pipe(model, chunks=8)
-                ''',
-                'use_case': 'Réseaux très profonds (>1000 layers)'
-            },
-            'hybrid_approach': {
-                'technique': 'Data + Model Parallelism',
-                'implementation': '''
-                # Combinaison pour maximiser l'utilisation GPU
-                model = DDP(
-                    Pipe(big_model, chunks=4), 
-                    device_ids=[local_rank]
-                )
-                ''',
-                'benefit': 'Optimisation pour clusters hétérogènes'
-            }
-        }
-        
-        return distributed_strategy
+        # Le code d'exemple de chaque stratégie n'est pas renvoyé : seul le
+        # nom du gabarit l'est, lisible via get_strategy_template()
+        return copy.deepcopy(_DISTRIBUTED_STRATEGY)
+    
+    @staticmethod
+    def get_strategy_template(template_name: str) -> str:
+        """Code d'exemple d'une stratégie d'entraînement distribué"""
+        return _load_strategy_template(template_name)
     
-    def _analyze_capacity_gap(self, current: int, target: int) -> Dict[str, Any]:
+    # Helpers purs de leurs arguments entiers : résultats immuables (dataclasses
+    # gelées, tuples), donc mis en cache et partagés sans risque entre appels,
+    # les plans étant interrogés en boucle par les tableaux de bord
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _analyze_capacity_gap(current: int, target: int) -> CapacityAnalysis:
         """Analyse l'écart de capacité"""
-        return {
-            'current_simulations': current,
-            'target_simulations': target,
-            'capacity_gap': target - current,
-            'scaling_factor': target / current if current > 0 else float('inf')
-        }
+        return CapacityAnalysis(
+            current_simulations=current,
+            target_simulations=target,
+            capacity_gap=target - current,
+            scaling_factor=target / current if current > 0 else float('inf')
+        )
     
     def _identify_bottlenecks(self, current_capacity: int) -> List[str]:
         """Identifie les goulots d'étranglement actuels"""
-        bottlenecks = []
-        
-        if current_capacity > 50:
-            bottlenecks.extend([
-                "Base de données: connexions simultanées limitées",
-                "Ressources GPU: allocation compétitive",
-                "Réseau: bande passante pour les gros datasets"
-            ])
-        
-        return bottlenecks
+        return list(_HIGH_LOAD_BOTTLENECKS) if current_capacity > 50 else []
     
-    def _calculate_infrastructure_requirements(self, target_capacity: int) -> Dict[str, Any]:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _calculate_infrastructure_requirements(target_capacity: int) -> InfrastructureRequirements:
         """Calcule les besoins en infrastructure"""
-        return {
-            'compute_requirements': {
-                'gpu_nodes': max(5, target_capacity // 10),
-                'cpu_nodes': max(3, target_capacity // 20),
-                'memory_total_gb': target_capacity * 8  # 8GB par simulation
-            },
-            'storage_requirements': {
-                'hot_storage_gb': target_capacity * 2,
-                'warm_storage_tb': target_capacity * 0.1,
-                'cold_storage_tb': target_capacity * 0.5
-            },
-            'network_requirements': {
-                'bandwidth_gbps': max(10, target_capacity // 5),
-                'latency_requirement': '< 10ms entre services'
-            }
-        }
+        return InfrastructureRequirements(
+            compute_requirements=ComputeRequirements(
+                gpu_nodes=max(5, target_capacity // 10),
+                cpu_nodes=max(3, target_capacity // 20),
+                memory_total_gb=target_capacity * 8  # 8GB par simulation
+            ),
+            storage_requirements=StorageRequirements(
+                hot_storage_gb=target_capacity * 2,
+                warm_storage_tb=target_capacity * 0.1,
+                cold_storage_tb=target_capacity * 0.5
+            ),
+            network_requirements=NetworkRequirements(
+                bandwidth_gbps=max(10, target_capacity // 5),
+                latency_requirement='< 10ms entre services'
+            )
+        )
     
-    def _generate_deployment_strategy(self, target_capacity: int) -> Dict[str, Any]:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _generate_deployment_strategy(target_capacity: int) -> DeploymentStrategy:
         """Génère la stratégie de déploiement"""
-        return {
-            'orchestrator': 'Kubernetes' if target_capacity > 50 else 'Docker Swarm',
-            'auto_scaling': {
-                'min_replicas': 3,
-                'max_replicas': 20,
-                'metrics': ['cpu_usage > 80%', 'gpu_usage > 90%', 'pending_simulations > 10']
-            },
-            'resource_management': {
-                'resource_quotas': 'Par équipe/projet',
-                'priority_classes': 'Haute priorité pour les simulations critiques',
-                'preemption': 'Simulations low-priority peuvent être interrompues'
-            }
-        }
+        return DeploymentStrategy(
+            orchestrator='Kubernetes' if target_capacity > 50 else 'Docker Swarm',
+            auto_scaling=AutoScaling(
+                min_replicas=3,
+                max_replicas=20,
+                metrics=('cpu_usage > 80%', 'gpu_usage > 90%', 'pending_simulations > 10')
+            ),
+            resource_management=ResourceManagement(
+                resource_quotas='Par équipe/projet',
+                priority_classes='Haute priorité pour les simulations critiques',
+                preemption='Simulations low-priority peuvent être interrompues'
+            )
+        )
     
-    def _define_monitoring_requirements(self, target_capacity: int) -> Dict[str, Any]:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _define_monitoring_requirements(target_capacity: int) -> MonitoringRequirements:
         """Définit les besoins de monitoring"""
-        return {
-            'metrics_to_track': [
+        return MonitoringRequirements(
+            metrics_to_track=(
                 'simulations_active',
                 'gpu_utilization_per_node', 
                 'memory_usage_per_service',
                 'api_response_times',
                 'job_queue_length'
-            ],
-            'alerting_thresholds': {
-                'high_gpu_wait_time': '> 5 minutes',
-                'low_success_rate': '< 95%',
-                'high_memory_usage': '> 90%',
-                'api_timeout': '> 30 seconds'
-            },
-            'logging_requirements': {
-                'level': 'INFO',
-                'retention': '30 days',
-                'aggregation': 'Centralized logging (ELK stack)'
-            }
-        }
+            ),
+            alerting_thresholds=AlertingThresholds(
+                high_gpu_wait_time='> 5 minutes',
+                low_success_rate='< 95%',
+                high_memory_usage='> 90%',
+                api_timeout='> 30 seconds'
+            ),
+            logging_requirements=LoggingRequirements(
+                level='INFO',
+                retention='30 days',
+                aggregation='Centralized logging (ELK stack)'
+            )
+        )
@@ -3,7 +3,9 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from enum import Enum
 
-@dataclass
+# Objets de domaine construits depuis les lignes Supabase et jamais modifiés
+# ensuite : slots (pas de __dict__ par instance), immuables, arguments nommés
+@dataclass(slots=True, frozen=True, kw_only=True)
 class User:
     id: str
     email: str
@@ -14,7 +16,7 @@ class User:
     created_at: datetime
     updated_at: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class Organization:
     id: str
     name: str
@@ -22,7 +24,7 @@ class Organization:
     created_at: datetime
     updated_at: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class Team:
     id: str
     org_id: str
@@ -30,7 +32,7 @@ class Team:
     specialization: Optional[str]
     created_at: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class PhysicsModel:
     id: str
     team_id: str
@@ -42,7 +44,7 @@ class PhysicsModel:
     created_at: datetime
     updated_at: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class Simulation:
     id: str
     team_id: str
@@ -58,7 +60,7 @@ class Simulation:
     created_at: datetime
     completed_at: Optional[datetime]
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class CodeAnalysis:
     id: str
     session_id: str
@@ -71,7 +73,7 @@ class CodeAnalysis:
     performance_metrics: Dict[str, Any]
     created_at: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class DigitalTwin:
     id: str
     team_id: str
@@ -85,7 +87,7 @@ class DigitalTwin:
     created_at: datetime
     updated_at: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class UsageMetrics:
     id: str
     org_id: str
@@ -1,6 +1,6 @@
 # backend/models/pydantic_models.py
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -24,15 +24,38 @@ class UserRole(str, Enum):
     ENGINEER = "engineer"
     VIEWER = "viewer"
 
+def _enum_member(enum_cls: type[Enum], field: str):
+    # Résolution directe valeur -> membre par le dict interne de l'Enum :
+    # les lignes Supabase portent des chaînes, le validateur d'enum ne fait
+    # ensuite qu'un isinstance. Une valeur inconnue est laissée telle quelle
+    # pour que pydantic lève son erreur habituelle.
+    members = enum_cls._value2member_map_
+
+    def resolve(cls, value):
+        if isinstance(value, enum_cls):
+            return value
+        return members.get(value, value)
+
+    return field_validator(field, mode="before")(resolve)
+
+class FrozenModel(BaseModel):
+    # Modèles d'API immuables (aucun code ne les modifie après validation) ;
+    # les champs inconnus des payloads sont ignorés. La configuration est
+    # fusionnée avec celle des sous-classes (from_attributes, ...).
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
 # Physics Models
-class PhysicsModelCreate(BaseModel):
+class PhysicsModelCreate(FrozenModel):
     name: str = Field(..., description="Physics model name")
     physics_type: PhysicsType
     equations: Dict[str, Any]
     boundary_conditions: Dict[str, Any]
     mesh_config: Optional[Dict[str, Any]] = None
 
-class PhysicsModelResponse(BaseModel):
+class PhysicsModelResponse(FrozenModel):
+    # Construit directement depuis les dataclasses du domaine (model_validate)
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     name: str
     physics_type: PhysicsType
@@ -41,13 +64,17 @@ class PhysicsModelResponse(BaseModel):
     mesh_config: Optional[Dict[str, Any]] = None
     created_at: datetime
 
-class SimulationCreate(BaseModel):
+    resolve_physics_type = _enum_member(PhysicsType, "physics_type")
+
+class SimulationCreate(FrozenModel):
     physics_model_id: str
     name: str
     input_parameters: Dict[str, Any]
     geometry_data: Optional[Dict[str, Any]] = None
 
-class SimulationResponse(BaseModel):
+class SimulationResponse(FrozenModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     name: str
     status: SimulationStatus
@@ -58,34 +85,38 @@ class SimulationResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime]
 
+    resolve_status = _enum_member(SimulationStatus, "status")
+
 # Scientific Copilot Models
-class CodeAnalysisRequest(BaseModel):
+class CodeAnalysisRequest(FrozenModel):
     code: str = Field(..., description="Source code to analyze")
     language: str = Field(..., description="Programming language")
     context: Optional[Dict[str, Any]] = Field(None, description="Physics context")
     analysis_type: str = Field("modernization", description="Analysis type")
 
-class CodeSuggestion(BaseModel):
+class CodeSuggestion(FrozenModel):
     original_code: str
     suggested_code: str
     explanation: str
     confidence_score: float
     boundary_conditions_check: Optional[Dict[str, Any]] = None
 
-class CodeAnalysisResponse(BaseModel):
+class CodeAnalysisResponse(FrozenModel):
     suggestions: List[CodeSuggestion]
     warnings: List[str]
     performance_metrics: Optional[Dict[str, Any]] = None
 
 # Digital Twins Models
-class DigitalTwinCreate(BaseModel):
+class DigitalTwinCreate(FrozenModel):
     name: str
     system_type: str
     optimization_objectives: Dict[str, str]
     constraints: Dict[str, Any]
     parameters_space: Dict[str, Any]
 
-class DigitalTwinResponse(BaseModel):
+class DigitalTwinResponse(FrozenModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     name: str
     system_type: str
@@ -94,19 +125,21 @@ class DigitalTwinResponse(BaseModel):
     parameters_space: Dict[str, Any]
     created_at: datetime
 
-class OptimizationRequest(BaseModel):
+class OptimizationRequest(FrozenModel):
     digital_twin_id: str
     parameters: Dict[str, Any]
     objectives: List[str]
 
 # Authentication and Organization Models
-class UserCreate(BaseModel):
+class UserCreate(FrozenModel):
     email: str = Field(..., description="User email")
     password: str = Field(..., min_length=8)
     full_name: str
     expertise_area: Optional[Dict[str, str]] = None
 
-class UserResponse(BaseModel):
+class UserResponse(FrozenModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     email: str
     full_name: str
@@ -114,60 +147,62 @@ class UserResponse(BaseModel):
     expertise_area: Optional[Dict[str, str]] = None
     created_at: datetime
 
-class OrganizationCreate(BaseModel):
+    resolve_role = _enum_member(UserRole, "role")
+
+class OrganizationCreate(FrozenModel):
     name: str
     subscription_tier: str = "freemium"
 
-class OrganizationResponse(BaseModel):
+class OrganizationResponse(FrozenModel):
     id: str
     name: str
     subscription_tier: str
     created_at: datetime
 
-class Token(BaseModel):
+class Token(FrozenModel):
     access_token: str
     token_type: str
     user: UserResponse
 
-class TokenData(BaseModel):
+class TokenData(FrozenModel):
     email: Optional[str] = None
 
 # Analytics Models
-class UsageMetricsResponse(BaseModel):
+class UsageMetricsResponse(FrozenModel):
     pinn_simulations_this_month: int
     copilot_requests_this_month: int
     storage_used_mb: float
     subscription_usage: Dict[str, Any]
 
-class PerformanceAnalyticsResponse(BaseModel):
+class PerformanceAnalyticsResponse(FrozenModel):
     average_simulation_time: float
     success_rate: float
     most_used_physics_models: List[str]
     resource_utilization: Dict[str, float]
 
 # Ajout des modèles pour l'optimisation
-class OptimizationParameter(BaseModel):
+class OptimizationParameter(FrozenModel):
     """Définit un paramètre à optimiser."""
     name: str
     initial_value: float
-    bounds: List[float] = Field(..., min_items=2, max_items=2, description="Bornes [min, max].")
+    bounds: List[float] = Field(..., min_length=2, max_length=2, description="Bornes [min, max].")
     unit: Optional[str] = None
 
-class OptimizationObjective(BaseModel):
+class OptimizationObjective(FrozenModel):
     """Définit un objectif d'optimisation."""
     name: str
     target: str = Field(..., description="'minimize' ou 'maximize'.")
     weight: float = 1.0
     # L'expression réelle de l'objectif serait gérée en interne
 
-class OptimizationConstraint(BaseModel):
+class OptimizationConstraint(FrozenModel):
     """Définit une contrainte d'optimisation."""
     name: str
     type: str = Field(..., description="'inequality' (<=) ou 'equality' (=).")
     expression: str = Field(..., description="Expression mathématique de la contrainte.")
     bound: float
 
-class OptimizationRequest(BaseModel):
+class OptimizationRequest(FrozenModel):
     """Modèle pour une nouvelle requête d'optimisation."""
     simulation_id: str = Field(..., description="ID de la simulation de base pour l'optimisation.")
     method: str = Field(..., description="Méthode d'optimisation (e.g., 'SLSQP', 'Bayesian').")
@@ -176,7 +211,7 @@ class OptimizationRequest(BaseModel):
     constraints: List[OptimizationConstraint]
     config: Dict[str, Any] = Field(..., description="Configuration spécifique à la méthode (e.g., max_iterations).")
 
-class OptimizationResult(BaseModel):
+class OptimizationResult(FrozenModel):
     """Modèle pour les résultats d'optimisation."""
     optimization_id: str
     status: str
@@ -1,60 +1,266 @@
-from typing import Dict, Any, Optional
+import asyncio
+import random
+from functools import cached_property
+from typing import Dict, Any, Optional, List, Tuple
+import httpx
+import msgspec
+from core.config import get_settings
 from utils.logger import logger
-from database.supabase_client import get_admin_supabase # Importation du client admin
+
+class RetrievedContext(msgspec.Struct, frozen=True):
+    """
+    Contexte vectoriel d'une requête, transporté tel quel entre le
+    ContextManager et l'orchestrateur (données internes, pas de validation
+    pydantic ; conversion éventuelle à la frontière HTTP seulement).
+    """
+    query: str
+    context_id: Optional[str] = None
+    relevant_documents: List[Any] = []
+    previous_results: List[Any] = []
+
+
+class _EdgeContextResponse(msgspec.Struct):
+    results: List[RetrievedContext]
+
+
+# Décodage direct des octets de la réponse Edge vers les Structs, sans dict
+# intermédiaire
+_edge_response_decoder = msgspec.json.Decoder(_EdgeContextResponse)
+
 
 class ContextManager:
     """
     Gère le contexte vectoriel pour l'orchestrateur.
     Interagit avec la fonction Edge 'vector-context' pour récupérer le contexte.
+
+    Les requêtes arrivant dans une même fenêtre de quelques millisecondes sont
+    regroupées en un seul appel à la fonction Edge (mode batch), via un
+    client HTTP asynchrone partagé qui garde ses connexions TLS ouvertes.
     """
+    # Fenêtre de regroupement et taille maximale d'un lot
+    BATCH_WINDOW_SECONDS = 0.005
+    MAX_BATCH_SIZE = 32
+    # Mises à jour de contexte en attente d'écriture (au-delà : abandonnées)
+    UPDATE_QUEUE_SIZE = 1024
+    # Délai maximal accordé à l'arrêt pour écrire les mises à jour en file
+    UPDATE_DRAIN_TIMEOUT = 5.0
+    EDGE_FUNCTION = "neurophysics-orchestrator-vector-context"
+    # Erreurs transitoires (pool saturé, connexion coupée, 5xx) : quelques
+    # tentatives avec backoff exponentiel à gigue avant de dégrader le contexte
+    MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 0.1
+    RETRYABLE_ERRORS = (
+        httpx.PoolTimeout,
+        httpx.ConnectError,
+        httpx.ReadTimeout,
+        httpx.RemoteProtocolError,
+    )
+
     def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._coalescer_task: Optional[asyncio.Task] = None
+        self._updates: Optional[asyncio.Queue] = None
+        self._updates_task: Optional[asyncio.Task] = None
+        self._http = self._new_http_client()
         logger.info("ContextManager initialisé.")
 
-    async def retrieve_context(self, query: str, context_id: Optional[str] = None) -> Dict[str, Any]:
+    @cached_property
+    def _edge_endpoint(self) -> Tuple[str, Dict[str, str]]:
+        """
+        URL et en-têtes de la fonction Edge, construits au premier appel puis
+        réutilisés (clé service_role pour garantir l'exécution de la fonction).
+        """
+        settings = get_settings()
+        return (
+            f"{settings.SUPABASE_URL}/functions/v1/{self.EDGE_FUNCTION}",
+            {
+                "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+                "apikey": settings.SUPABASE_SERVICE_KEY,
+            },
+        )
+
+    @staticmethod
+    def _new_http_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+            timeout=httpx.Timeout(5.0),
+        )
+
+    def _reset_http(self):
+        """
+        Remplace le client HTTP après des échecs répétés (connexions HTTP/2
+        mortes restées dans le pool) ; l'ancien est fermé en tâche de fond.
+        """
+        stale, self._http = self._http, self._new_http_client()
+        asyncio.get_running_loop().create_task(stale.aclose())
+
+    async def _post_edge(self, url: str, payload: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        """
+        POST vers la fonction Edge avec retry sur les erreurs transitoires.
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = await self._http.post(url, json=payload, headers=headers)
+                if response.status_code < 500:
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except self.RETRYABLE_ERRORS as e:
+                error = e
+
+            if attempt == self.MAX_ATTEMPTS - 1:
+                self._reset_http()
+                raise error
+            logger.warning("Appel Edge Function en échec (%r), nouvelle tentative %s/%s", error, attempt + 2, self.MAX_ATTEMPTS)
+            await asyncio.sleep(random.uniform(0, self.RETRY_BASE_DELAY * 2 ** attempt))
+
+    async def aclose(self):
+        """
+        Écrit les mises à jour en file (dans la limite de
+        UPDATE_DRAIN_TIMEOUT), arrête les tâches de fond et ferme le pool de
+        connexions HTTP.
+        """
+        if self._updates_task is not None:
+            try:
+                await asyncio.wait_for(self._updates.join(), self.UPDATE_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("%s mise(s) à jour de contexte non écrite(s) à l'arrêt", self._updates.qsize())
+            self._updates_task.cancel()
+            self._updates_task = None
+            self._updates = None
+        if self._coalescer_task is not None:
+            self._coalescer_task.cancel()
+            self._coalescer_task = None
+            self._queue = None
+        await self._http.aclose()
+
+    async def retrieve_context(self, query: str, context_id: Optional[str] = None) -> RetrievedContext:
         """
         Récupère le contexte pertinent (documents, résultats précédents, etc.)
         à partir de la fonction Edge 'vector-context'.
         """
-        logger.info(f"Appel de la fonction Edge 'vector-context' pour la requête: {query}")
-        
-        # Utilisation du client admin pour garantir l'exécution de la fonction Edge
-        supabase_admin_client = get_admin_supabase()
-        
+        loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._coalescer_task = loop.create_task(self._coalesce())
+
+        future = loop.create_future()
+        await self._queue.put((query, context_id, future))
+        return await future
+
+    async def _coalesce(self):
+        """
+        Tâche de fond : draine la file par lots (MAX_BATCH_SIZE ou
+        BATCH_WINDOW_SECONDS) et résout chaque future avec son contexte.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.BATCH_WINDOW_SECONDS
+
+            while len(batch) < self.MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await self.retrieve_context_many(
+                    [(query, context_id) for query, context_id, _ in batch]
+                )
+                for (_, _, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def retrieve_context_many(self, requests: List[Tuple[str, Optional[str]]]) -> List[RetrievedContext]:
+        """
+        Récupère le contexte de plusieurs requêtes en un seul appel à la
+        fonction Edge 'vector-context'. L'ordre des résultats suit celui des requêtes.
+        """
+        logger.info("Appel de la fonction Edge 'vector-context' pour %s requête(s)", len(requests))
+
+        url, headers = self._edge_endpoint
+
         try:
-            # L'appel à functions.invoke est synchrone dans la librairie Python
-            response = supabase_admin_client.functions.invoke(
-                "neurophysics-orchestrator-vector-context",
-                invoke_options={
-                    "body": {"query": query, "context_id": context_id},
-                    "method": "POST",
-                    "headers": {"Content-Type": "application/json"}
-                }
+            response = await self._post_edge(
+                url,
+                {
+                    "queries": [
+                        {"query": query, "context_id": context_id}
+                        for query, context_id in requests
+                    ]
+                },
+                headers
             )
-            
-            # La librairie Python renvoie un objet Response avec .data et .error
-            if response.error:
-                logger.error(f"Erreur d'appel Edge Function: {response.error.message}")
+
+            if response.is_error:
+                logger.error("Erreur d'appel Edge Function: %s %s", response.status_code, response.text)
                 # Lever une exception pour que l'orchestrateur puisse gérer l'échec
-                raise Exception(f"Erreur de contexte vectoriel: {response.error.message}")
-                
-            context_data = response.data
-            logger.info(f"Contexte récupéré (documents: {len(context_data.get('relevant_documents', []))})")
-            return context_data
-            
+                raise Exception(f"Erreur de contexte vectoriel: HTTP {response.status_code}")
+
+            contexts = _edge_response_decoder.decode(response.content).results
+            logger.info("Contexte récupéré pour %s requête(s)", len(contexts))
+            return contexts
+
         except Exception as e:
-            logger.error(f"Échec de la récupération de contexte: {e}")
+            logger.error("Échec de la récupération de contexte: %s", e)
             # Retourner un contexte vide en cas d'échec pour éviter de bloquer l'orchestrateur
-            return {
-                "query": query,
-                "context_id": context_id if context_id else "new_session_123",
-                "relevant_documents": [],
-                "previous_results": []
-            }
+            return [
+                RetrievedContext(
+                    query=query,
+                    context_id=context_id if context_id else "new_session_123"
+                )
+                for query, context_id in requests
+            ]
 
-    async def update_context(self, context_id: str, new_data: Dict[str, Any]):
+    def update_context(self, context_id: str, new_data: Dict[str, Any]) -> bool:
         """
         Met à jour le contexte avec de nouvelles informations (résultats de tâches, etc.).
+        L'écriture est faite par une tâche de fond : l'appelant n'attend pas
+        la base vectorielle. Retourne False si la file est pleine (mise à jour
+        abandonnée).
+        """
+        if self._updates is None:
+            self._updates = asyncio.Queue(maxsize=self.UPDATE_QUEUE_SIZE)
+            self._updates_task = asyncio.get_running_loop().create_task(self._apply_updates())
+
+        try:
+            self._updates.put_nowait((context_id, new_data))
+        except asyncio.QueueFull:
+            logger.warning("File des mises à jour de contexte pleine, mise à jour de %s abandonnée", context_id)
+            return False
+        return True
+
+    async def _apply_updates(self):
+        """
+        Tâche de fond : écrit les mises à jour de contexte une par une.
+        """
+        while True:
+            context_id, new_data = await self._updates.get()
+            try:
+                await self._write_context(context_id, new_data)
+            except Exception as e:
+                logger.error("Échec de la mise à jour du contexte %s: %s", context_id, e)
+            finally:
+                self._updates.task_done()
+
+    async def _write_context(self, context_id: str, new_data: Dict[str, Any]):
+        """
+        Écriture effective dans la base vectorielle.
         Cette fonction est conservée mais ne fait rien pour l'instant.
         """
-        logger.info(f"Mise à jour du contexte {context_id} avec de nouvelles données (simulée).")
-        pass
+        logger.info("Mise à jour du contexte %s avec de nouvelles données (simulée).", context_id)
+
+
+# Instance partagée par le processus (routeur vector_db et orchestrateur) :
+# une seule file de regroupement et un seul pool de connexions.
+context_manager = ContextManager()
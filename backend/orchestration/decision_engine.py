@@ -1,8 +1,88 @@
-from typing import Dict, Any, List
+import copy
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from .context_manager import RetrievedContext
+from .plan_cache import SemanticPlanCache
 from utils.logger import logger
 # Importation simulée d'un LLM pour la planification
 # services.ai_models import LLMPlanner 
 
+# Plans simulés ; 'depends_on' liste les indices des étapes dont chaque tâche
+# consomme les résultats (étapes indépendantes exécutées en parallèle par le
+# PlanExecutor)
+def _heat_simulation_plan() -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "description": "Plan pour simuler le transfert de chaleur avec PINN.",
+        "steps": [
+            {"task_type": "data_preparation", "params": {"dataset": "thermal_data", "preprocess": True}, "depends_on": []},
+            {"task_type": "pinn_training", "params": {"model": "heat_transfer", "epochs": 1000, "config_id": "config_A"}, "depends_on": [0]},
+            {"task_type": "results_analysis", "params": {"metrics": ["L2_error", "convergence_rate"]}, "depends_on": [1]}
+        ]
+    }
+
+def _shape_optimization_plan() -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "description": "Plan pour optimiser la forme aérodynamique.",
+        "steps": [
+            {"task_type": "mesh_generation", "params": {"geometry": "airfoil", "resolution": "high"}, "depends_on": []},
+            {"task_type": "optimization_run", "params": {"engine": "multi_objective", "objective": "drag_reduction"}, "depends_on": [0]},
+            {"task_type": "digital_twin_update", "params": {"twin_id": "aero_twin_v2"}, "depends_on": [1]}
+        ]
+    }
+
+def _default_plan(user_request: str) -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "description": "Plan par défaut: recherche de contexte et synthèse.",
+        "steps": [
+            {"task_type": "context_search", "params": {"query": user_request}, "depends_on": []},
+            {"task_type": "synthesis", "params": {"data_source": "context_search_results"}, "depends_on": [0]}
+        ]
+    }
+
+# Intentions reconnues, par ordre de priorité : tous les mots-clés doivent
+# apparaître dans la requête
+_INTENT_KEYWORDS = {
+    "heat_simulation": frozenset({"simuler", "chaleur"}),
+    "shape_optimization": frozenset({"optimiser", "forme"}),
+}
+
+_PLAN_BUILDERS = {
+    "heat_simulation": _heat_simulation_plan,
+    "shape_optimization": _shape_optimization_plan,
+}
+
+@lru_cache(maxsize=64)
+def _plan_template(intent: str) -> Dict[str, Any]:
+    # Plans d'intention indépendants de la requête : construits une fois,
+    # copiés pour chaque appelant (le PlanExecutor et le cache sémantique
+    # ne doivent pas partager de dict modifiable)
+    return _PLAN_BUILDERS[intent]()
+
+# Tous les mots-clés dans une seule alternation compilée à l'import
+# (insensible à la casse) : un seul parcours de la requête
+_KEYWORD_PATTERN = re.compile(
+    "|".join(
+        re.escape(keyword)
+        for keyword in sorted(set().union(*_INTENT_KEYWORDS.values()), key=len, reverse=True)
+    ),
+    re.IGNORECASE
+)
+
+def _detect_intent(user_request: str) -> Optional[str]:
+    """
+    Intention reconnue dans la requête (un seul passage de l'alternation),
+    ou None pour le plan par défaut.
+    """
+    found = {match.group(0).lower() for match in _KEYWORD_PATTERN.finditer(user_request)}
+    return next(
+        (intent for intent, keywords in _INTENT_KEYWORDS.items() if keywords <= found),
+        None
+    )
+
 class DecisionEngine:
     """
     Moteur de décision basé sur l'IA pour générer un plan d'exécution
@@ -10,50 +90,43 @@ class DecisionEngine:
     """
     def __init__(self):
         # self.llm_planner = LLMPlanner() # Modèle de langage pour la planification
+        self.plan_cache = SemanticPlanCache()
         logger.info("DecisionEngine initialisé.")
 
-    async def generate_plan(self, user_request: str, context_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_plan(self, user_request: str, context_data: RetrievedContext) -> Dict[str, Any]:
         """
         Génère un plan d'exécution structuré (séquence de tâches) pour la requête.
+        Les requêtes proches d'une requête récente de même intention
+        réutilisent son plan.
+        """
+        intent = _detect_intent(user_request)
+        vector = self.plan_cache.embed(user_request)
+        cached_plan = self.plan_cache.lookup(user_request, vector, intent)
+        if cached_plan is not None:
+            return cached_plan
+
+        plan = await self._plan(user_request, context_data, intent)
+        if plan.get("status") == "success":
+            self.plan_cache.store(vector, plan, intent)
+        return plan
+
+    async def _plan(self, user_request: str, context_data: RetrievedContext, intent: Optional[str]) -> Dict[str, Any]:
+        """
+        Planification effective (appel LLM).
         """
         logger.info(f"Génération du plan pour la requête: {user_request}")
         
         # Contexte enrichi pour le LLM (simulation)
-        prompt_context = f"Requête utilisateur: {user_request}\nContexte pertinent: {context_data['relevant_documents']}"
+        prompt_context = f"Requête utilisateur: {user_request}\nContexte pertinent: {context_data.relevant_documents}"
         
         # Simulation de l'appel au LLM pour la planification
         # plan_json = await self.llm_planner.generate(prompt_context)
         
-        # Plan d'exécution simulé
-        if "simuler" in user_request.lower() and "chaleur" in user_request.lower():
-            plan = {
-                "status": "success",
-                "description": "Plan pour simuler le transfert de chaleur avec PINN.",
-                "steps": [
-                    {"task_type": "data_preparation", "params": {"dataset": "thermal_data", "preprocess": True}},
-                    {"task_type": "pinn_training", "params": {"model": "heat_transfer", "epochs": 1000, "config_id": "config_A"}},
-                    {"task_type": "results_analysis", "params": {"metrics": ["L2_error", "convergence_rate"]}}
-                ]
-            }
-        elif "optimiser" in user_request.lower() and "forme" in user_request.lower():
-            plan = {
-                "status": "success",
-                "description": "Plan pour optimiser la forme aérodynamique.",
-                "steps": [
-                    {"task_type": "mesh_generation", "params": {"geometry": "airfoil", "resolution": "high"}},
-                    {"task_type": "optimization_run", "params": {"engine": "multi_objective", "objective": "drag_reduction"}},
-                    {"task_type": "digital_twin_update", "params": {"twin_id": "aero_twin_v2"}}
-                ]
-            }
+        # Plan d'exécution simulé : plan correspondant à l'intention détectée
+        if intent is None:
+            plan = _default_plan(user_request)
         else:
-            plan = {
-                "status": "success",
-                "description": "Plan par défaut: recherche de contexte et synthèse.",
-                "steps": [
-                    {"task_type": "context_search", "params": {"query": user_request}},
-                    {"task_type": "synthesis", "params": {"data_source": "context_search_results"}}
-                ]
-            }
+            plan = copy.deepcopy(_plan_template(intent))
 
         logger.info(f"Plan généré avec {len(plan.get('steps', []))} étapes.")
         return plan
@@ -1,7 +1,8 @@
 from typing import Dict, Any, List
 from .plan_executor import PlanExecutor
-from .context_manager import ContextManager
+from .context_manager import context_manager
 from .decision_engine import DecisionEngine
+from .plan_cache import PlanResultCache
 from .task_dispatcher import TaskDispatcher
 from utils.logger import logger
 
@@ -10,12 +11,16 @@ class NeuroPhysicsOrchestrator:
     Service principal d'orchestration pour les tâches complexes de neurophysique.
     Utilise un moteur de décision pour créer un plan, un gestionnaire de contexte
     pour les données vectorielles, et un exécuteur pour les tâches.
+
+    Les plans exécutés récemment sont mis en cache (PlanResultCache) : la
+    même requête dans le même contexte est servie sans refaire le pipeline.
     """
     def __init__(self):
-        self.context_manager = ContextManager()
+        self.context_manager = context_manager
         self.decision_engine = DecisionEngine()
         self.plan_executor = PlanExecutor()
         self.task_dispatcher = TaskDispatcher()
+        self.result_cache = PlanResultCache()
         logger.info("NeuroPhysicsOrchestrator initialisé.")
 
     async def process_request(self, user_request: str, context_id: str = None) -> Dict[str, Any]:
@@ -24,6 +29,13 @@ class NeuroPhysicsOrchestrator:
         """
         logger.info(f"Traitement de la requête: {user_request}")
 
+        cache_key = self.result_cache.key(user_request, context_id)
+        cached = self.result_cache.lookup(cache_key, user_request)
+        if cached is not None:
+            plan, execution_result = cached
+            logger.info("Plan et résultat servis depuis le cache de l'orchestrateur")
+            return self._response(user_request, context_id, plan, execution_result)
+
         # 1. Récupération du contexte
         context_data = await self.context_manager.retrieve_context(user_request, context_id)
         
@@ -36,14 +48,18 @@ class NeuroPhysicsOrchestrator:
         # 3. Exécution du plan
         execution_result = await self.plan_executor.execute_plan(plan)
 
+        self.result_cache.store(cache_key, plan, execution_result)
+
         # 4. Synthèse des résultats (simulée ici)
-        final_result = self._synthesize_results(user_request, execution_result)
+        return self._response(user_request, context_id, plan, execution_result)
 
+    def _response(self, user_request: str, context_id: str, plan: Dict[str, Any], execution_result: Dict[str, Any]) -> Dict[str, Any]:
+        # Synthèse refaite pour chaque requête, y compris depuis le cache
         return {
             "status": "success",
             "request": user_request,
             "plan": plan,
-            "result": final_result,
+            "result": self._synthesize_results(user_request, execution_result),
             "context_id": context_id
         }
 
@@ -0,0 +1,141 @@
+import copy
+import hashlib
+import time
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from cachetools import TTLCache
+from sklearn.feature_extraction.text import HashingVectorizer
+from utils.logger import logger
+
+def adapt_plan(plan: Dict[str, Any], user_request: str) -> Dict[str, Any]:
+    """
+    Copie d'un plan en cache dont les paramètres dépendant de la requête
+    ('query') sont remplacés par la requête courante.
+    """
+    adapted = copy.deepcopy(plan)
+    for step in adapted.get("steps", []):
+        params = step.get("params", {})
+        if "query" in params:
+            params["query"] = user_request
+    return adapted
+
+class SemanticPlanCache:
+    """
+    Cache sémantique des plans générés par le DecisionEngine.
+    Une requête proche (similarité cosinus >= SIMILARITY_THRESHOLD) d'une
+    requête déjà planifiée réutilise son plan au lieu d'un nouvel appel LLM,
+    seulement si les deux requêtes ont la même intention détectée : deux
+    requêtes qui ne diffèrent que par un mot-clé ('chaleur' / 'couleur')
+    sont proches en n-grammes mais n'appellent pas le même plan.
+
+    Les requêtes sont projetées par hachage de n-grammes de caractères
+    (vecteurs L2-normalisés, sans modèle à charger) : les reformulations
+    proches et les variantes d'accents ou de ponctuation se retrouvent,
+    la recherche est un produit matrice-vecteur NumPy.
+    """
+    SIMILARITY_THRESHOLD = 0.92
+    TTL_SECONDS = 600
+    MAX_ENTRIES = 512
+    N_FEATURES = 2 ** 11
+
+    def __init__(self):
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=(3, 4),
+            n_features=self.N_FEATURES,
+            alternate_sign=False,
+            norm="l2",
+        )
+        self._vectors = np.empty((0, self.N_FEATURES), dtype=np.float32)
+        self._plans: List[Dict[str, Any]] = []
+        self._intents: List[Optional[str]] = []
+        self._expires_at = np.empty(0, dtype=np.float64)
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, user_request: str) -> np.ndarray:
+        # Le vectoriseur met déjà la requête en minuscules (lowercase=True)
+        return self._vectorizer.transform([user_request]).toarray()[0].astype(np.float32)
+
+    def lookup(self, user_request: str, vector: np.ndarray, intent: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Plan en cache de même intention le plus proche de la requête, adapté
+        à celle-ci, ou None.
+        """
+        self._evict_expired()
+        if self._plans:
+            same_intent = np.fromiter((cached == intent for cached in self._intents), dtype=bool, count=len(self._intents))
+            scores = np.where(same_intent, self._vectors @ vector, -1.0)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.SIMILARITY_THRESHOLD:
+                self.hits += 1
+                logger.info("Plan servi depuis le cache sémantique (similarité %.3f)", scores[best])
+                return adapt_plan(self._plans[best], user_request)
+
+        self.misses += 1
+        return None
+
+    def store(self, vector: np.ndarray, plan: Dict[str, Any], intent: Optional[str]):
+        # Au-delà de MAX_ENTRIES, les entrées les plus anciennes sont retirées
+        keep = self.MAX_ENTRIES - 1
+        self._vectors = np.vstack([self._vectors[-keep:], vector[np.newaxis, :]])
+        self._expires_at = np.append(self._expires_at[-keep:], time.monotonic() + self.TTL_SECONDS)
+        self._plans = self._plans[-keep:] + [copy.deepcopy(plan)]
+        self._intents = self._intents[-keep:] + [intent]
+
+    def _evict_expired(self):
+        alive = self._expires_at > time.monotonic()
+        if not alive.all():
+            self._vectors = self._vectors[alive]
+            self._expires_at = self._expires_at[alive]
+            self._plans = [plan for plan, keep in zip(self._plans, alive) if keep]
+            self._intents = [intent for intent, keep in zip(self._intents, alive) if keep]
+
+class PlanResultCache:
+    """
+    Cache des plans exécutés par l'orchestrateur (plan + résultat
+    d'exécution), indexé par contexte et par requête exacte, à la casse et
+    aux espaces près : une similarité approchée rejouerait le résultat d'une
+    requête qui ne diffère que par une valeur numérique.
+
+    Seuls les plans sans tâche de calcul ni effet de bord
+    (UNCACHEABLE_TASKS) sont conservés, et jamais sans contexte (les
+    requêtes sans context_id ne partagent pas de portée commune).
+    """
+    TTL_SECONDS = 600
+    MAX_ENTRIES = 512
+    UNCACHEABLE_TASKS = frozenset({"pinn_training", "optimization_run", "digital_twin_update"})
+
+    def __init__(self):
+        self._entries: TTLCache = TTLCache(maxsize=self.MAX_ENTRIES, ttl=self.TTL_SECONDS)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(user_request: str, context_id: Optional[str]) -> Optional[Tuple[str, bytes]]:
+        if context_id is None:
+            return None
+        normalized = " ".join(user_request.casefold().split())
+        return context_id, hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+    def lookup(self, key: Optional[Tuple[str, bytes]], user_request: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        (plan adapté à la requête, copie du résultat d'exécution) en cache
+        pour cette clé, ou None.
+        """
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        plan, execution_result = entry
+        return adapt_plan(plan, user_request), copy.deepcopy(execution_result)
+
+    def store(self, key: Optional[Tuple[str, bytes]], plan: Dict[str, Any], execution_result: Dict[str, Any]):
+        if key is None or execution_result.get("status") != "success":
+            return
+        if any(step.get("task_type") in self.UNCACHEABLE_TASKS for step in plan.get("steps", [])):
+            return
+        self._entries[key] = copy.deepcopy((plan, execution_result))
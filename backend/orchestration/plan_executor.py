@@ -1,54 +1,80 @@
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, List, Set
 from .task_dispatcher import TaskDispatcher
 from utils.logger import logger
 
 class PlanExecutor:
     """
     Exécute un plan d'action généré par le moteur de décision.
-    Le plan est une séquence de tâches à distribuer.
+    Le plan est un graphe de tâches à distribuer (clé 'depends_on' de chaque
+    étape ; sans elle, l'étape dépend de la précédente).
     """
     def __init__(self):
         self.task_dispatcher = TaskDispatcher()
         logger.info("PlanExecutor initialisé.")
 
+    @staticmethod
+    def _dependencies(steps: List[Dict[str, Any]]) -> List[Set[int]]:
+        """
+        Dépendances de chaque étape (indices 0-based) : clé 'depends_on' du
+        plan, ou à défaut l'étape précédente (exécution séquentielle).
+        """
+        return [
+            set(step["depends_on"]) if "depends_on" in step else ({i - 1} if i else set())
+            for i, step in enumerate(steps)
+        ]
+
+    async def _run_step(self, i: int, step: Dict[str, Any], total: int) -> Dict[str, Any]:
+        task_type = step.get("task_type")
+        task_params = step.get("params", {})
+
+        logger.info("Étape %s/%s: Distribution de la tâche %s", i + 1, total, task_type)
+
+        try:
+            # Utilise le TaskDispatcher pour envoyer la tâche
+            task_result = await self.task_dispatcher.dispatch_task(task_type, task_params)
+            return {
+                "step": i + 1,
+                "task_type": task_type,
+                "status": "success",
+                "output": task_result
+            }
+        except Exception as e:
+            logger.error("Erreur lors de l'exécution de la tâche %s: %s", task_type, e)
+            return {
+                "step": i + 1,
+                "task_type": task_type,
+                "status": "error",
+                "error": str(e)
+            }
+
     async def execute_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Parcourt les étapes du plan et distribue les tâches.
+        Distribue les tâches du plan par vagues : toutes les étapes dont les
+        dépendances sont terminées partent en parallèle, puis la frontière est
+        recalculée. Les résultats restent dans l'ordre des étapes.
         """
         steps = plan.get("steps", [])
-        results = []
-        
-        logger.info(f"Démarrage de l'exécution du plan avec {len(steps)} étapes.")
-
-        for i, step in enumerate(steps):
-            task_type = step.get("task_type")
-            task_params = step.get("params", {})
-            
-            logger.info(f"Étape {i+1}/{len(steps)}: Distribution de la tâche {task_type}")
-            
-            try:
-                # Utilise le TaskDispatcher pour envoyer la tâche
-                task_result = await self.task_dispatcher.dispatch_task(task_type, task_params)
-                
-                results.append({
-                    "step": i + 1,
-                    "task_type": task_type,
-                    "status": "success",
-                    "output": task_result
-                })
-                
-                # Mise à jour du contexte si nécessaire (omise pour la simplicité)
-                
-            except Exception as e:
-                logger.error(f"Erreur lors de l'exécution de la tâche {task_type}: {e}")
-                results.append({
-                    "step": i + 1,
-                    "task_type": task_type,
-                    "status": "error",
-                    "error": str(e)
-                })
-                # Arrêter l'exécution en cas d'erreur critique
-                return {"status": "failure", "error": f"Échec à l'étape {i+1}", "steps": results}
+        dependencies = self._dependencies(steps)
+        results: Dict[int, Dict[str, Any]] = {}
+        pending = set(range(len(steps)))
+
+        logger.info("Démarrage de l'exécution du plan avec %s étapes.", len(steps))
+
+        while pending:
+            ready = sorted(i for i in pending if dependencies[i] <= results.keys())
+            if not ready:
+                logger.error("Dépendances du plan insatisfaisables pour les étapes %s", sorted(pending))
+                return {"status": "failure", "error": "Dépendances du plan invalides", "steps": [results[i] for i in sorted(results)]}
+
+            outcomes = await asyncio.gather(*(self._run_step(i, steps[i], len(steps)) for i in ready))
+            results.update(zip(ready, outcomes))
+            pending.difference_update(ready)
+
+            # Arrêter l'exécution en cas d'erreur critique
+            failed = [i for i in ready if results[i]["status"] == "error"]
+            if failed:
+                return {"status": "failure", "error": f"Échec à l'étape {failed[0]+1}", "steps": [results[i] for i in sorted(results)]}
 
         logger.info("Exécution du plan terminée avec succès.")
-        return {"status": "success", "steps": results}
+        return {"status": "success", "steps": [results[i] for i in sorted(results)]}
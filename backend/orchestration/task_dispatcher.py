@@ -1,57 +1,197 @@
-from typing import Dict, Any
+import asyncio
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set
+from celery import group
+from celery_app.worker import app as celery_app
+from core.config import get_settings
 from utils.logger import logger
-# Importation simulée des tâches Celery
-# from celery_app.pinn_tasks import run_pinn_training
-# from celery_app.optimization_tasks import run_optimization
+
+# Types de tâches exécutés par un worker Celery, par nom de tâche (envoi par
+# nom : les modules de tâches, et torch, ne sont pas importés par l'API)
+CELERY_TASKS = {
+    "pinn_training": "pinn_tasks.run_pinn_training",
+    "optimization_run": "optimization_tasks.run_optimization",
+}
+# Attente maximale des résultats d'un lot de tâches Celery, et intervalle
+# entre deux vérifications de l'état du lot
+CELERY_RESULT_TIMEOUT = 300
+CELERY_POLL_INTERVAL = 0.5
+
+# Appels bloquants au broker / backend de résultats sur un pool dédié :
+# le pool par défaut de la boucle (asyncio.to_thread) sert les requêtes
+# Supabase et ne doit pas être occupé par des lots Celery
+_celery_io = ThreadPoolExecutor(max_workers=4, thread_name_prefix="celery-io")
 
 class TaskDispatcher:
     """
     Distribue les tâches aux systèmes d'exécution appropriés (Celery, exécution locale, etc.).
+
+    Les tâches Celery arrivant dans une même fenêtre de quelques
+    millisecondes sont regroupées par type et envoyées en un seul lot au
+    broker (group/chunks) au lieu d'un .delay() par tâche.
     """
+    # Fenêtre de regroupement et taille maximale d'un lot
+    BATCH_WINDOW_SECONDS = 0.005
+    MAX_BATCH_SIZE = 32
+
     def __init__(self):
-        # Mapping des types de tâches aux fonctions d'exécution (simulées)
+        # Mapping des types de tâches locales aux fonctions d'exécution (simulées)
         self.task_map = {
-            "data_preparation": self._simulate_celery_task,
-            "pinn_training": self._simulate_celery_task, # run_pinn_training.delay
-            "optimization_run": self._simulate_celery_task, # run_optimization.delay
             "results_analysis": self._simulate_local_task,
             "context_search": self._simulate_local_task,
             "synthesis": self._simulate_local_task,
-            "mesh_generation": self._simulate_celery_task,
             "digital_twin_update": self._simulate_local_task,
         }
+        # Tâches Celery, exécutées par lot
+        self.batch_map = {
+            "data_preparation": self._simulate_celery_batch,
+            "pinn_training": self._celery_batch,
+            "optimization_run": self._celery_batch,
+            "mesh_generation": self._simulate_celery_batch,
+        }
+        self._queue: Optional[asyncio.Queue] = None
+        self._coalescer_task: Optional[asyncio.Task] = None
+        # Envois en cours (référence forte tant qu'ils ne sont pas terminés)
+        self._flushes: Set[asyncio.Task] = set()
         logger.info("TaskDispatcher initialisé.")
 
     async def dispatch_task(self, task_type: str, params: Dict[str, Any]) -> Any:
         """
         Distribue et exécute la tâche spécifiée.
         """
-        if task_type not in self.task_map:
+        if task_type not in self.task_map and task_type not in self.batch_map:
             raise ValueError(f"Type de tâche inconnu: {task_type}")
 
-        executor = self.task_map[task_type]
-        
         logger.info(f"Distribution de la tâche '{task_type}' avec les paramètres: {params}")
-        
-        # Dans un environnement réel, cela pourrait être:
-        # if task_type == "pinn_training":
-        #     result = run_pinn_training.delay(**params).get(timeout=300)
-        # else:
-        #     result = await executor(task_type, params)
-        
-        result = await executor(task_type, params)
-        
-        return result
-
-    async def _simulate_celery_task(self, task_type: str, params: Dict[str, Any]) -> str:
-        """
-        Simule l'envoi d'une tâche asynchrone via Celery.
-        """
-        logger.info(f"Simulant l'envoi de la tâche Celery: {task_type}")
-        # Attente simulée pour la complétion asynchrone
-        import asyncio
-        await asyncio.sleep(0.5) 
-        return f"Tâche Celery '{task_type}' terminée. Résultat simulé pour {params.get('model', 'N/A')}."
+
+        if task_type in self.task_map:
+            return await self.task_map[task_type](task_type, params)
+
+        loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._coalescer_task = loop.create_task(self._coalesce())
+
+        future = loop.create_future()
+        await self._queue.put((task_type, params, future))
+        return await future
+
+    async def _coalesce(self):
+        """
+        Tâche de fond : draine la file par fenêtres (MAX_BATCH_SIZE ou
+        BATCH_WINDOW_SECONDS), regroupe par type et lance un envoi par lot
+        sans attendre la fin du précédent.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            window = [await self._queue.get()]
+            deadline = loop.time() + self.BATCH_WINDOW_SECONDS
+
+            while len(window) < self.MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    window.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batches: Dict[str, List] = defaultdict(list)
+            for task_type, params, future in window:
+                batches[task_type].append((params, future))
+            for task_type, batch in batches.items():
+                flush = loop.create_task(self._flush(task_type, batch))
+                self._flushes.add(flush)
+                flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, task_type: str, batch: List):
+        """
+        Envoie un lot de tâches d'un même type et résout chaque future avec
+        son résultat. Une exception à la position d'une tâche dans les
+        résultats n'échoue que cette tâche ; une exception levée par l'envoi
+        échoue tout le lot.
+        """
+        try:
+            results = await self.batch_map[task_type](task_type, [params for params, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _celery_batch(self, task_type: str, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Lot envoyé aux workers Celery s'ils sont déployés
+        (CELERY_ORCHESTRATOR_TASKS), simulé sinon.
+        """
+        if get_settings().CELERY_ORCHESTRATOR_TASKS:
+            return await self._run_celery_batch(task_type, params_list)
+        return await self._simulate_celery_batch(task_type, params_list)
+
+    async def _run_celery_batch(self, task_type: str, params_list: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Envoie un lot de tâches Celery en un seul group et attend leurs
+        résultats. L'attente se fait par vérifications périodiques de l'état
+        du lot : aucun thread n'est bloqué pendant l'exécution des tâches.
+        Chaque tâche en échec (ou non terminée à l'échéance) donne son
+        exception à sa position, sans faire échouer les autres.
+        """
+        logger.info("Envoi de %s tâche(s) Celery: %s", len(params_list), task_type)
+        loop = asyncio.get_running_loop()
+        batch = group(
+            celery_app.signature(CELERY_TASKS[task_type], args=(params,))
+            for params in params_list
+        )
+        group_result = await loop.run_in_executor(_celery_io, batch.apply_async)
+
+        deadline = loop.time() + CELERY_RESULT_TIMEOUT
+        while not await loop.run_in_executor(_celery_io, group_result.ready):
+            if loop.time() >= deadline:
+                break
+            await asyncio.sleep(CELERY_POLL_INTERVAL)
+
+        return await loop.run_in_executor(
+            _celery_io, functools.partial(self._collect_results, task_type, group_result)
+        )
+
+    @staticmethod
+    def _collect_results(task_type: str, group_result) -> List[Any]:
+        """
+        Résultat de chaque tâche du lot, ou son exception (échec de la
+        tâche, ou TimeoutError si elle n'est pas terminée).
+        """
+        results: List[Any] = []
+        for async_result in group_result.results:
+            if not async_result.ready():
+                results.append(TimeoutError(
+                    f"Tâche Celery '{task_type}' non terminée après {CELERY_RESULT_TIMEOUT} s"
+                ))
+            else:
+                # En cas d'échec, result porte l'exception de la tâche
+                results.append(async_result.result)
+        return results
+
+    async def _simulate_celery_batch(self, task_type: str, params_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Simule l'envoi d'un lot de tâches via Celery (pas encore de tâche
+        worker pour ce type).
+        """
+        logger.info("Simulant l'envoi de %s tâche(s) Celery: %s", len(params_list), task_type)
+        settings = get_settings()
+        if settings.DEBUG and settings.SIMULATE_TASK_LATENCY:
+            await asyncio.sleep(0.5) # Simuler l'attente de la complétion
+        return [
+            f"Tâche Celery '{task_type}' terminée. Résultat simulé pour {params.get('model', 'N/A')}."
+            for params in params_list
+        ]
 
     async def _simulate_local_task(self, task_type: str, params: Dict[str, Any]) -> str:
         """
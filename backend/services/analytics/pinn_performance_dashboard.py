@@ -1,61 +1,114 @@
 # backend/services/analytics/pinn_performance_dashboard.py
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import os
 import random
 import time
 import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
 
+# Colonnes lues depuis le fichier Parquet (les autres ne sont pas chargées)
+_SIMULATION_COLUMNS = [
+    "simulation_id",
+    "model_type",
+    "status",
+    "execution_time",
+    "final_loss",
+    "organization_id",
+    "user_id",
+]
+
 class AnalyticsService:
     """
     Service pour agréger et analyser les métriques de performance
     des simulations PINN et l'utilisation globale de la plateforme.
     """
 
-    def __init__(self):
-        # Simulation de données pour l'exemple
-        self.simulation_data = self._generate_mock_data()
-        logger.info("AnalyticsService initialisé avec des données simulées.")
+    def __init__(self, data_path: Optional[str] = None):
+        # Données lues en colonnes (Arrow) depuis le fichier Parquet s'il est
+        # configuré, sinon données simulées pour l'exemple
+        data_path = data_path or os.getenv("ANALYTICS_DATA_PATH")
+        if data_path:
+            table = pq.read_table(data_path, columns=_SIMULATION_COLUMNS)
+            logger.info("AnalyticsService initialisé depuis %s (%s simulations).", data_path, table.num_rows)
+        else:
+            table = self._generate_mock_data()
+            logger.info("AnalyticsService initialisé avec des données simulées.")
+
+        # Seule copie conservée : DataFrame indexé (trié) par organisation,
+        # pour des filtrages et agrégations vectorisés ; la table Arrow n'est
+        # pas gardée
+        self.df = table.to_pandas().set_index("organization_id").sort_index()
+        del table
+        # Index de hachage pandas des identifiants (position de la ligne)
+        # pour l'historique
+        self._ids = pd.Index(self.df["simulation_id"])
+        # Modèles les plus utilisés par organisation, comptés une seule fois
+        # au chargement (les données ne changent plus ensuite)
+        top_models = (
+            self.df.groupby(level="organization_id")["model_type"]
+            .value_counts()
+            .groupby(level="organization_id")
+            .head(3)
+        )
+        self._most_used_models: Dict[str, List[str]] = {}
+        for organization_id, model_type in top_models.index:
+            self._most_used_models.setdefault(organization_id, []).append(model_type)
 
-    def _generate_mock_data(self) -> List[Dict[str, Any]]:
+    def export_parquet(self, path: str):
+        """Écrit les données de simulation au format Parquet."""
+        pq.write_table(pa.Table.from_pandas(self.df.reset_index(), preserve_index=False), path)
+
+    def _generate_mock_data(self, size: int = 50) -> pa.Table:
         """Génère des données de simulation factices pour l'analyse."""
-        data = []
-        model_types = ["NavierStokes", "HeatTransfer", "Structural"]
-        statuses = ["COMPLETED", "FAILED"]
+        # Toutes les colonnes tirées en une fois par le générateur NumPy,
+        # assemblées directement en table Arrow
+        rng = np.random.default_rng()
+        index = np.arange(size)
+        status = rng.choice(["COMPLETED", "FAILED"], size)
+        completed = status == "COMPLETED"
         
-        for i in range(50):
-            model = random.choice(model_types)
-            status = random.choice(statuses)
-            data.append({
-                "simulation_id": f"sim_{i:03d}",
-                "model_type": model,
-                "status": status,
-                "execution_time": random.uniform(10.0, 300.0),
-                "final_loss": random.uniform(1e-6, 1e-4) if status == "COMPLETED" else None,
-                "organization_id": "org_a" if i < 40 else "org_b",
-                "user_id": f"user_{random.randint(1, 5)}"
-            })
-        return data
+        return pa.table({
+            "simulation_id": np.char.add("sim_", np.char.zfill(index.astype(str), 3)),
+            "model_type": rng.choice(["NavierStokes", "HeatTransfer", "Structural"], size),
+            "status": status,
+            "execution_time": rng.uniform(10.0, 300.0, size),
+            # Pas de perte finale pour les simulations en échec (null Arrow)
+            "final_loss": pa.array(rng.uniform(1e-6, 1e-4, size), mask=~completed),
+            "organization_id": np.where(index < 40, "org_a", "org_b"),
+            "user_id": np.char.add("user_", rng.integers(1, 6, size).astype(str)),
+        })
+
+    def _org_simulations(self, organization_id: str) -> pd.DataFrame:
+        """Simulations d'une organisation (DataFrame vide si aucune)."""
+        if organization_id not in self.df.index:
+            return self.df.iloc[:0]
+        # Sélection par liste : toujours un DataFrame, même pour une seule ligne
+        return self.df.loc[[organization_id]]
 
     async def get_usage_metrics(self, organization_id: str) -> Dict[str, Any]:
         """
         Calcule les métriques d'utilisation pour une organisation.
         """
-        org_simulations = [s for s in self.simulation_data if s["organization_id"] == organization_id]
+        simulation_count = len(self._org_simulations(organization_id))
         
         # Simuler les requêtes Copilot et l'utilisation du stockage
-        copilot_requests = len(org_simulations) * random.randint(2, 5)
-        storage_used_mb = len(org_simulations) * random.uniform(5.0, 50.0)
+        copilot_requests = simulation_count * random.randint(2, 5)
+        storage_used_mb = simulation_count * random.uniform(5.0, 50.0)
         
         return {
-            "pinn_simulations_this_month": len(org_simulations),
+            "pinn_simulations_this_month": simulation_count,
             "copilot_requests_this_month": copilot_requests,
             "storage_used_mb": round(storage_used_mb, 2),
             "subscription_usage": {
-                "used": len(org_simulations),
+                "used": simulation_count,
                 "total": 100, # Exemple de limite
-                "percentage": round(len(org_simulations) / 100 * 100, 1)
+                "percentage": round(simulation_count / 100 * 100, 1)
             }
         }
 
@@ -63,10 +116,9 @@ class AnalyticsService:
         """
         Calcule les analyses de performance des simulations.
         """
-        org_simulations = [s for s in self.simulation_data if s["organization_id"] == organization_id]
-        completed_simulations = [s for s in org_simulations if s["status"] == "COMPLETED"]
+        org_simulations = self._org_simulations(organization_id)
         
-        if not org_simulations:
+        if org_simulations.empty:
             return {
                 "average_simulation_time": 0.0,
                 "success_rate": 0.0,
@@ -74,17 +126,16 @@ class AnalyticsService:
                 "resource_utilization": {"cpu_percent": 0.0, "memory_percent": 0.0}
             }
 
+        completed = org_simulations["status"] == "COMPLETED"
+        
         # Temps moyen
-        avg_time = sum(s["execution_time"] for s in completed_simulations) / len(completed_simulations) if completed_simulations else 0.0
+        avg_time = float(org_simulations.loc[completed, "execution_time"].mean()) if completed.any() else 0.0
         
         # Taux de succès
-        success_rate = len(completed_simulations) / len(org_simulations)
+        success_rate = float(completed.mean())
         
         # Modèles les plus utilisés
-        model_counts = {}
-        for s in org_simulations:
-            model_counts[s["model_type"]] = model_counts.get(s["model_type"], 0) + 1
-        most_used = sorted(model_counts, key=model_counts.get, reverse=True)[:3]
+        most_used = list(self._most_used_models.get(organization_id, []))
         
         # Utilisation des ressources (simulée)
         resource_utilization = {
@@ -104,16 +155,26 @@ class AnalyticsService:
         """
         Récupère l'historique détaillé d'une simulation.
         """
-        for s in self.simulation_data:
-            if s["simulation_id"] == simulation_id:
-                # Ajouter des détails d'historique simulés
-                s["history"] = [
-                    {"timestamp": time.time() - 3600, "event": "Simulation started"},
-                    {"timestamp": time.time() - 1800, "event": "Loss reduced to 1e-3"},
-                    {"timestamp": time.time(), "event": f"Simulation {s['status']}"}
-                ]
-                return s
-        return None
+        try:
+            row = self._ids.get_loc(simulation_id)
+        except KeyError:
+            return None
+        simulation = self.df.iloc[[row]].reset_index().to_dict("records")[0]
+        # Perte finale absente (simulation en échec) : NaN côté pandas
+        if pd.isna(simulation["final_loss"]):
+            simulation["final_loss"] = None
+
+        # Copie enrichie de l'historique simulé : la donnée partagée n'est
+        # pas modifiée d'un appel à l'autre
+        now = time.time()
+        return {
+            **simulation,
+            "history": [
+                {"timestamp": now - 3600, "event": "Simulation started"},
+                {"timestamp": now - 1800, "event": "Loss reduced to 1e-3"},
+                {"timestamp": now, "event": f"Simulation {simulation['status']}"}
+            ]
+        }
 
 # Exemple d'utilisation
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 # /backend/services/cloud_orchestrator.py
 from typing import Dict, List, Any
 import asyncio
+import numpy as np
 
 class CloudSolutionAnalyzer:
     """Analyseur des solutions cloud pour le calcul scientifique"""
@@ -29,6 +30,18 @@ class CloudSolutionAnalyzer:
                 'fastapi_integration': 'Via Azure API Management'
             }
         }
+        
+        # Caractéristiques des solutions en colonnes (une entrée par solution,
+        # dans l'ordre de self.solutions) : le scoring est une seule
+        # expression vectorisée quel que soit le nombre de fournisseurs
+        specs = list(self.solutions.values())
+        self._solution_names = list(self.solutions)
+        self._gpu_costs = np.array([spec['cost_per_hour_gpu'] for spec in specs])
+        self._excellent_gpu = np.array([spec['gpu_support'] == 'excellent' for spec in specs])
+        self._native_integration = np.array(['native' in spec['fastapi_integration'] for spec in specs])
+        self._easy_integration = self._native_integration | np.array(
+            ['good' in spec['fastapi_integration'] for spec in specs]
+        )
     
     async def analyze_workload(self, simulation_config: Dict[str, Any]) -> Dict[str, Any]:
         """Analyse la charge de travail pour recommander la meilleure solution cloud"""
@@ -37,37 +50,28 @@ class CloudSolutionAnalyzer:
         estimated_gpu_hours = self._estimate_gpu_requirements(simulation_config)
         memory_requirements = simulation_config.get('memory_gb', 16)
         
-        recommendations = []
-        
-        for solution, specs in self.solutions.items():
-            score = 0
-            
-            # Score basé sur les besoins GPU
-            if estimated_gpu_hours > 10 and specs['gpu_support'] == 'excellent':
-                score += 40
-            elif estimated_gpu_hours <= 10:
-                score += 30
-                
-            # Score coût
-            total_cost = estimated_gpu_hours * specs['cost_per_hour_gpu']
-            if total_cost < 50:
-                score += 30
-            else:
-                score += 20
-                
-            # Score intégration
-            if 'good' in specs['fastapi_integration'] or 'native' in specs['fastapi_integration']:
-                score += 30
-                
-            recommendations.append({
-                'solution': solution,
-                'score': score,
-                'estimated_cost': total_cost,
-                'integration_complexity': 'low' if 'native' in specs['fastapi_integration'] else 'medium'
-            })
+        # Score GPU + score coût + score intégration
+        total_costs = estimated_gpu_hours * self._gpu_costs
+        if estimated_gpu_hours > 10:
+            gpu_scores = np.where(self._excellent_gpu, 40, 0)
+        else:
+            gpu_scores = np.full(len(self._solution_names), 30)
+        scores = (
+            gpu_scores
+            + np.where(total_costs < 50, 30, 20)
+            + np.where(self._easy_integration, 30, 0)
+        )
         
-        # Tri par score
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
+        # Tri par score (stable : ordre de déclaration à score égal)
+        recommendations = [
+            {
+                'solution': self._solution_names[i],
+                'score': int(scores[i]),
+                'estimated_cost': float(total_costs[i]),
+                'integration_complexity': 'low' if self._native_integration[i] else 'medium'
+            }
+            for i in np.argsort(-scores, kind='stable')
+        ]
         
         return {
             'workload_analysis': {
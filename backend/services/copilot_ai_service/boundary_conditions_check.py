@@ -1,18 +1,17 @@
 # backend/services/copilot_ai_service/boundary_conditions_check.py
 
+import hashlib
+import threading
 from typing import Dict, Any
+import orjson
+from cachetools import TTLCache
 from .gpt_wrapper import get_ai_response
 
-def check_boundary_conditions_consistency(model_config: Dict[str, Any], user_input: str) -> Dict[str, Any]:
-    """
-    Vérifie la cohérence des conditions aux limites fournies par l'utilisateur
-    avec le modèle physique sélectionné.
-    """
-    prompt = f"""
+# Instructions fixes en tête du prompt, entrées variables à la fin : le
+# préfixe commun reste identique d'un appel à l'autre (cache de préfixe du
+# fournisseur)
+_BOUNDARY_CHECK_INSTRUCTIONS = """
     En tant qu'expert en physique numérique, analysez la configuration du modèle et les conditions aux limites fournies.
-    Modèle Physique: {model_config.get('model_type')}
-    Configuration du Modèle: {model_config}
-    Conditions aux Limites Fournies: {user_input}
 
     Vérifiez les points suivants:
     1. Complétude: Toutes les frontières nécessaires (entrée, sortie, murs, etc.) ont-elles des conditions définies?
@@ -20,9 +19,39 @@ def check_boundary_conditions_consistency(model_config: Dict[str, Any], user_inp
     3. Format: Les conditions sont-elles dans un format utilisable par le solveur (par exemple, des équations ou des valeurs numériques claires)?
 
     Fournissez un rapport concis. Si des problèmes sont trouvés, proposez des corrections ou des questions à l'utilisateur.
+"""
+
+# Réponses déjà obtenues pour une même configuration et les mêmes
+# conditions, indexées par empreinte des entrées canonisées
+_response_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_response_cache_lock = threading.Lock()
+
+def _cache_key(model_config: Dict[str, Any], user_input: str) -> str:
+    canonical = orjson.dumps(
+        {"cfg": model_config, "input": user_input},
+        option=orjson.OPT_SORT_KEYS,
+        default=str
+    )
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+def check_boundary_conditions_consistency(model_config: Dict[str, Any], user_input: str) -> Dict[str, Any]:
     """
-    
-    response = get_ai_response(prompt, max_tokens=500)
+    Vérifie la cohérence des conditions aux limites fournies par l'utilisateur
+    avec le modèle physique sélectionné.
+    """
+    key = _cache_key(model_config, user_input)
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+
+    if response is None:
+        prompt = f"""{_BOUNDARY_CHECK_INSTRUCTIONS}
+    Modèle Physique: {model_config.get('model_type')}
+    Configuration du Modèle: {model_config}
+    Conditions aux Limites Fournies: {user_input}
+    """
+        response = get_ai_response(prompt, max_tokens=500)
+        with _response_cache_lock:
+            _response_cache[key] = response
     
     # Simuler une analyse plus poussée basée sur la réponse de l'IA
     analysis_result = {
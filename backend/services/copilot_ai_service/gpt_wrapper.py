@@ -7,12 +7,11 @@ from core.config import get_settings
 from utils.logger import copilot_logger
 from core.exceptions import CodeAnalysisError
 
-settings = get_settings()
-
 class GPTWrapper:
     """Wrapper for OpenAI API with scientific prompt management"""
     
     def __init__(self):
+        settings = get_settings()
         self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_PINNs_KEY)
         self.system_prompts = self._load_system_prompts()
         self.conversation_history = {}
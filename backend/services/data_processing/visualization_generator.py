@@ -14,6 +14,12 @@ class VisualizationGenerator:
     Génère des visualisations (e.g., cartes de chaleur, lignes de courant)
     à partir des données de simulation traitées.
     """
+    # Mise en forme commune, construite une fois ; seuls le titre et les
+    # données changent d'un appel à l'autre
+    FIGURE_LAYOUT = {"figsize": (10, 8)}
+    AXES_LAYOUT = {"xlabel": "Coordonnée X", "ylabel": "Coordonnée Y"}
+    HEATMAP_STYLE = {"origin": "lower", "aspect": "auto", "cmap": "viridis"}
+    QUIVER_STYLE = {"cmap": "jet", "scale": 50, "headwidth": 5}
 
     def __init__(self):
         pass
@@ -31,7 +37,7 @@ class VisualizationGenerator:
         Y = data["Y_coords"]
         Z = data["Field_Grid"]
 
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = plt.subplots(**self.FIGURE_LAYOUT)
         
         # Utiliser pcolormesh pour une grille non nécessairement régulière
         # Note: Pour une grille régulière, imshow pourrait être plus simple, mais pcolormesh est plus général.
@@ -42,14 +48,10 @@ class VisualizationGenerator:
         # Si X et Y sont 1D, nous pouvons utiliser extent pour imshow
         im = ax.imshow(Z, 
                        extent=[X.min(), X.max(), Y.min(), Y.max()], 
-                       origin='lower', 
-                       aspect='auto', 
-                       cmap='viridis')
+                       **self.HEATMAP_STYLE)
         
         fig.colorbar(im, ax=ax, label=field_name)
-        ax.set_title(f"Carte de Chaleur de {field_name}")
-        ax.set_xlabel("Coordonnée X")
-        ax.set_ylabel("Coordonnée Y")
+        ax.set(title=f"Carte de Chaleur de {field_name}", **self.AXES_LAYOUT)
         
         # Sauvegarder l'image dans un buffer en mémoire
         buf = io.BytesIO()
@@ -76,7 +78,7 @@ class VisualizationGenerator:
         U = data["Field_Grid_U"]
         V = data["Field_Grid_V"]
 
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = plt.subplots(**self.FIGURE_LAYOUT)
         
         # Créer un meshgrid pour les coordonnées
         X_mesh, Y_mesh = np.meshgrid(X, Y)
@@ -86,13 +88,9 @@ class VisualizationGenerator:
         
         ax.quiver(X_mesh[skip], Y_mesh[skip], U[skip], V[skip], 
                   np.sqrt(U[skip]**2 + V[skip]**2), # Couleur basée sur la magnitude
-                  cmap='jet', 
-                  scale=50, # Ajuster l'échelle pour la taille des flèches
-                  headwidth=5)
+                  **self.QUIVER_STYLE)
         
-        ax.set_title(f"Champ de Vecteurs ({u_field}, {v_field})")
-        ax.set_xlabel("Coordonnée X")
-        ax.set_ylabel("Coordonnée Y")
+        ax.set(title=f"Champ de Vecteurs ({u_field}, {v_field})", **self.AXES_LAYOUT)
         ax.set_aspect('equal', adjustable='box')
         
         # Sauvegarder l'image dans un buffer en mémoire
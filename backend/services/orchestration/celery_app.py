@@ -1,16 +1,16 @@
 from celery import Celery
-from supabase import create_client
-import os
 import asyncio
 
-# Configuration Celery avec Redis
-celery_app = Celery('neurophysics_tasks',
-                    broker=os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
-                    backend=os.getenv('REDIS_URL'))
+from core.config import get_settings
+from database.supabase_client import get_admin_supabase
 
-# Client Supabase pour la communication bidirectionnelle
-# NOTE: Assurez-vous que SUPABASE_URL et SUPABASE_SERVICE_KEY sont définis dans l'environnement du worker Celery
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_KEY'))
+# Configuration Celery avec Redis (même source de configuration que l'API),
+# résolue paresseusement à la première lecture de celery_app.conf
+celery_app = Celery('neurophysics_tasks')
+celery_app.add_defaults(lambda: {
+    'broker_url': get_settings().CELERY_BROKER_URL,
+    'result_backend': get_settings().CELERY_RESULT_BACKEND,
+})
 
 # Fonction utilitaire pour exécuter des fonctions asynchrones dans Celery
 def run_async(func, *args, **kwargs):
@@ -29,6 +29,8 @@ def start_pinn_simulation(self, simulation_params: dict, orchestration_id: str):
     from services.pinns_solver import NavierStokesSolver # Assurez-vous que ce chemin est correct
     
     async def _run_simulation():
+        # Client Supabase admin partagé du processus, pour la communication bidirectionnelle
+        supabase = get_admin_supabase()
         try:
             # Mise à jour de l'état pour le suivi
             self.update_state(state='PROGRESS', meta={'progress': 10, 'status': 'Initializing physics model...'})
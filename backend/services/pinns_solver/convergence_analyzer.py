@@ -1,7 +1,6 @@
 # /backend/services/pinns_solver/convergence_analyzer.py
 import numpy as np
 from typing import Dict, List, Any, Tuple
-import plotly.graph_objects as go
 
 class PINNConvergenceDebugger:
     """Débogueur spécialisé pour les problèmes de convergence PINN"""
@@ -140,11 +140,9 @@ class NavierStokesSolver:
         if len(self.loss_history) < window:
             return False
         
-        recent_losses = self.loss_history[-window:]
-        improvements = [abs(recent_losses[i-1] - recent_losses[i]) 
-                       for i in range(1, len(recent_losses))]
-        
-        avg_improvement = np.mean(improvements)
+        # Appelé à chaque epoch : écarts successifs calculés en une réduction NumPy
+        recent_losses = np.asarray(self.loss_history[-window:])
+        avg_improvement = np.abs(np.diff(recent_losses)).mean()
         return avg_improvement < threshold
     
     def _compute_convergence_metrics(self) -> Dict[str, Any]:
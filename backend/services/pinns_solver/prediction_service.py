@@ -225,12 +225,13 @@ class PinnPredictionService:
         # Sample data for visualization (avoid sending too much data)
         sampling_rate = max(1, len(points) // 1000)  # Target ~1000 points
         
-        visualization_data['points'] = points[::sampling_rate].tolist()
+        # Tableaux laissés en NumPy (copie contiguë de l'échantillon) : orjson
+        # les sérialise directement, sans liste Python intermédiaire
+        visualization_data['points'] = np.ascontiguousarray(points[::sampling_rate])
         
         for field_name, field_data in results.items():
             if field_name != 'metadata' and isinstance(field_data, np.ndarray):
-                sampled_data = field_data[::sampling_rate]
-                visualization_data[field_name] = sampled_data.tolist()
+                visualization_data[field_name] = np.ascontiguousarray(field_data[::sampling_rate])
         
         return visualization_data
     
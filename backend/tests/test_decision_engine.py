@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from orchestration.context_manager import RetrievedContext
+from orchestration.decision_engine import DecisionEngine
+
+HEAT_REQUEST = "Peux-tu simuler la chaleur dans le tube en cuivre du réacteur principal ?"
+
+
+def _task_types(plan):
+    return [step["task_type"] for step in plan["steps"]]
+
+
+def _generate(engine, user_request):
+    return asyncio.run(engine.generate_plan(user_request, RetrievedContext(query=user_request)))
+
+
+@pytest.fixture
+def engine():
+    return DecisionEngine()
+
+
+def test_near_duplicate_request_reuses_cached_plan(engine):
+    _generate(engine, HEAT_REQUEST)
+
+    plan = _generate(engine, HEAT_REQUEST.replace("Peux-tu", "Peux tu"))
+
+    assert _task_types(plan) == ["data_preparation", "pinn_training", "results_analysis"]
+    assert engine.plan_cache.hits == 1
+
+
+@pytest.mark.parametrize(
+    "user_request",
+    [
+        HEAT_REQUEST.replace("chaleur", "couleur"),
+        "Je voudrais calculer la chaleur et le flux dans le tube en cuivre du réacteur principal.",
+    ],
+)
+def test_near_duplicate_with_other_intent_gets_its_own_plan(engine, user_request):
+    _generate(engine, HEAT_REQUEST)
+    _generate(engine, "Je voudrais simuler la chaleur et le flux dans le tube en cuivre du réacteur principal.")
+    # Assez proche en n-grammes pour qu'un cache sans intention le serve
+    vector = engine.plan_cache.embed(user_request)
+    assert float((engine.plan_cache._vectors @ vector).max()) >= engine.plan_cache.SIMILARITY_THRESHOLD
+
+    plan = _generate(engine, user_request)
+
+    assert _task_types(plan) == ["context_search", "synthesis"]
+    assert plan["steps"][0]["params"]["query"] == user_request
+    assert engine.plan_cache.hits == 0
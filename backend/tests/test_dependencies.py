@@ -0,0 +1,247 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Annotated
+
+import jwt as pyjwt
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from api import dependencies
+from api.dependencies import CurrentUser, RepoFactory, User
+from api.routers import auth
+
+SECRET = "test-secret"
+
+
+class _CountingUsers:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_by_id(self, user_id: str):
+        self.calls += 1
+        return {
+            "id": user_id,
+            "email": "user@example.com",
+            "full_name": "Test User",
+            "role": "engineer",
+            "created_at": "2024-01-01T00:00:00+00:00",
+        }
+
+
+class _FakeTokenRevocations:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.since = None
+        self.deleted_before = None
+
+    async def get_since(self, since: datetime):
+        self.since = since
+        return self.rows
+
+    async def delete_before(self, before: datetime):
+        self.deleted_before = before
+
+
+class _FakeRepositoryFactory:
+    def __init__(self):
+        self.users = _CountingUsers()
+        self.token_revocations = _FakeTokenRevocations()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    real_decode = pyjwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(dependencies.jwt, "decode", counting_decode)
+    monkeypatch.setattr(dependencies, "SECRET_KEY", SECRET)
+    dependencies._token_cache.clear()
+    yield calls
+    dependencies._token_cache.clear()
+
+
+@pytest.fixture
+def repo_factory(monkeypatch):
+    factory = _FakeRepositoryFactory()
+    monkeypatch.setattr(dependencies, "_repo_factory", factory)
+    return factory
+
+
+@pytest.fixture
+def revocations(monkeypatch):
+    monkeypatch.setattr(dependencies, "_revocations", {})
+    monkeypatch.setattr(dependencies, "get_settings", lambda: SimpleNamespace(ACCESS_TOKEN_EXPIRE_MINUTES=60))
+    return dependencies._revocations
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/auth")
+
+    # Sous-dépendances qui réclament chacune l'utilisateur courant
+    # (vérification de rôle, résolution du tenant)
+    async def require_member(current_user: CurrentUser):
+        return current_user
+
+    async def resolve_tenant(current_user: CurrentUser, repo_factory: RepoFactory):
+        return current_user.id
+
+    @app.get("/probe")
+    async def probe(
+        current_user: CurrentUser,
+        member: Annotated[User, Depends(require_member)],
+        tenant: Annotated[str, Depends(resolve_tenant)],
+    ):
+        return {"shared": member is current_user, "tenant": tenant}
+
+    return TestClient(app)
+
+
+def _token(**claims) -> str:
+    payload = {"sub": "user_1", "email": "user@example.com", "exp": int(time.time()) + 60}
+    payload.update(claims)
+    return pyjwt.encode(payload, SECRET, algorithm="HS256")
+
+
+def _headers(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_token_decoded_once_for_several_auth_dependencies(client, decode_calls, repo_factory):
+    response = client.get("/probe", headers=_headers(_token()))
+
+    assert response.status_code == 200
+    assert response.json() == {"shared": True, "tenant": "user_1"}
+    assert len(decode_calls) == 1
+    assert repo_factory.users.calls == 0
+
+
+def test_invalid_token_fails_once_without_lookup(client, decode_calls, repo_factory):
+    response = client.get("/probe", headers=_headers(_token() + "x"))
+
+    assert response.status_code == 401
+    assert len(decode_calls) == 1
+    assert repo_factory.users.calls == 0
+
+
+def test_me_with_partial_claims_looks_up_user_once(client, decode_calls, repo_factory):
+    response = client.get("/auth/me", headers=_headers(_token()))
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "user_1"
+    assert len(decode_calls) == 1
+    assert repo_factory.users.calls == 1
+
+
+def test_me_with_profile_claims_skips_lookup(client, decode_calls, repo_factory):
+    token = _token(
+        full_name="Test User",
+        role="engineer",
+        expertise_area={},
+        created_at="2024-01-01T00:00:00+00:00",
+    )
+
+    response = client.get("/auth/me", headers=_headers(token))
+
+    assert response.status_code == 200
+    assert len(decode_calls) == 1
+    assert repo_factory.users.calls == 0
+
+
+def test_token_issued_before_revocation_is_rejected(client, decode_calls, repo_factory, revocations):
+    now = time.time()
+    revocations["user_1"] = now
+
+    response = client.get("/probe", headers=_headers(_token(iat=int(now) - 10)))
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "JWT révoqué"
+
+
+def test_iat_us_orders_token_and_revocation_within_one_second(client, decode_calls, repo_factory, revocations):
+    revoked_at = float(int(time.time())) + 0.5
+    revocations["user_1"] = revoked_at
+    second = int(revoked_at)
+
+    before = _token(iat=second, iat_us=int((revoked_at - 0.25) * 1_000_000))
+    after = _token(iat=second, iat_us=int((revoked_at + 0.25) * 1_000_000))
+
+    assert client.get("/probe", headers=_headers(before)).status_code == 401
+    assert client.get("/probe", headers=_headers(after)).status_code == 200
+
+
+def test_cached_token_is_rejected_once_revoked(client, decode_calls, repo_factory, revocations):
+    token = _token(iat=int(time.time()) - 10)
+    assert client.get("/probe", headers=_headers(token)).status_code == 200
+
+    revocations["user_1"] = time.time()
+
+    assert client.get("/probe", headers=_headers(token)).status_code == 401
+    assert len(decode_calls) == 1
+
+
+def test_is_revoked_without_issued_at_treats_token_as_oldest(revocations):
+    revocations["user_1"] = time.time()
+
+    assert dependencies._is_revoked("user_1", None)
+    assert not dependencies._is_revoked("user_2", None)
+
+
+def test_refresh_loads_only_revocations_within_token_lifetime(repo_factory, revocations):
+    revoked_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    repo_factory.token_revocations.rows = [{"user_id": "user_1", "revoked_at": revoked_at.isoformat()}]
+
+    asyncio.run(dependencies._refresh_revocations())
+
+    horizon = datetime.now(timezone.utc) - timedelta(minutes=60)
+    assert abs((repo_factory.token_revocations.since - horizon).total_seconds()) < 5
+    assert dependencies._revocations == {"user_1": revoked_at.timestamp()}
+
+
+def test_refresh_keeps_newer_local_revocations_and_drops_expired_ones(repo_factory, revocations):
+    now = datetime.now(timezone.utc)
+    stored = now - timedelta(minutes=5)
+    repo_factory.token_revocations.rows = [
+        {"user_id": "user_1", "revoked_at": stored.isoformat()},
+        {"user_id": "user_2", "revoked_at": stored.isoformat()},
+    ]
+    revocations.update({
+        # Révocation locale pas encore visible dans la lecture
+        "user_1": now.timestamp(),
+        # Plus ancienne que la base : la base l'emporte
+        "user_2": (stored - timedelta(minutes=1)).timestamp(),
+        # Hors horizon : ne vise plus que des tokens expirés
+        "user_3": (now - timedelta(minutes=61)).timestamp(),
+    })
+
+    asyncio.run(dependencies._refresh_revocations())
+
+    assert dependencies._revocations == {"user_1": now.timestamp(), "user_2": stored.timestamp()}
+
+
+def test_refresh_failure_keeps_last_known_revocations(repo_factory, revocations):
+    async def unavailable(since):
+        raise ConnectionError("base injoignable")
+
+    repo_factory.token_revocations.get_since = unavailable
+    revocations["user_1"] = time.time()
+    known = dict(revocations)
+
+    asyncio.run(dependencies._refresh_revocations())
+
+    assert dependencies._revocations == known
+
+
+def test_prune_deletes_revocations_outside_token_lifetime(repo_factory, revocations):
+    asyncio.run(dependencies._prune_revocations())
+
+    horizon = datetime.now(timezone.utc) - timedelta(minutes=60)
+    assert abs((repo_factory.token_revocations.deleted_before - horizon).total_seconds()) < 5
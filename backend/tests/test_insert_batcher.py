@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from database.repositories import InsertBatcher
+
+
+class _FakeInsert:
+    def __init__(self, client, rows):
+        self._client = client
+        self._rows = rows
+
+    def execute(self):
+        self._client.inserts.append([row["name"] for row in self._rows])
+        if any(row["name"].startswith("bad") for row in self._rows):
+            raise ValueError(f"violation de contrainte: {self._rows}")
+        return SimpleNamespace(data=[{**row, "id": row["name"]} for row in self._rows])
+
+
+class _FakeClient:
+    """Client PostgREST factice : INSERT atomique, refusé si une ligne est invalide."""
+
+    def __init__(self):
+        self.inserts = []
+
+    def table(self, name):
+        return SimpleNamespace(insert=lambda rows: _FakeInsert(self, rows))
+
+
+@pytest.fixture
+def client():
+    return _FakeClient()
+
+
+def test_rows_submitted_together_share_one_insert_up_to_max_batch(client):
+    batcher = InsertBatcher(client, "usage_metrics", max_batch=2, max_delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit({"name": name}) for name in "abc"))
+
+    rows = asyncio.run(run())
+
+    assert [row["id"] for row in rows] == ["a", "b", "c"]
+    assert client.inserts == [["a", "b"], ["c"]]
+
+
+def test_lone_row_is_flushed_after_max_delay(client):
+    batcher = InsertBatcher(client, "usage_metrics", max_delay=0.01)
+
+    async def run():
+        first = await batcher.submit({"name": "a"})
+        second = await batcher.submit({"name": "b"})
+        return first, second
+
+    assert [row["id"] for row in asyncio.run(run())] == ["a", "b"]
+    assert client.inserts == [["a"], ["b"]]
+
+
+def test_full_queue_raises_queue_full(client):
+    batcher = InsertBatcher(client, "usage_metrics", max_pending=1)
+
+    async def run():
+        first = batcher.submit({"name": "a"})
+        with pytest.raises(asyncio.QueueFull):
+            batcher.submit({"name": "b"})
+        return await first
+
+    assert asyncio.run(run())["id"] == "a"
+
+
+def test_failed_batch_is_retried_row_by_row(client):
+    batcher = InsertBatcher(client, "usage_metrics", max_delay=0.05)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit({"name": name}) for name in ("a", "bad", "c")),
+            return_exceptions=True,
+        )
+
+    first, bad, third = asyncio.run(run())
+
+    assert (first["id"], third["id"]) == ("a", "c")
+    assert isinstance(bad, ValueError)
+    assert client.inserts[0] == ["a", "bad", "c"]
+    assert sorted(client.inserts[1:]) == [["a"], ["bad"], ["c"]]
+
+
+def test_aclose_flushes_pending_rows(client):
+    batcher = InsertBatcher(client, "usage_metrics", max_delay=60)
+
+    async def run():
+        futures = [batcher.submit({"name": name}) for name in "ab"]
+        # Laisse la tâche de fond commencer à constituer le lot
+        await asyncio.sleep(0)
+        await batcher.aclose()
+        return [future.result() for future in futures]
+
+    assert [row["id"] for row in asyncio.run(run())] == ["a", "b"]
+    assert client.inserts == [["a", "b"]]
+
+
+def test_aclose_flushes_rows_still_queued(client):
+    batcher = InsertBatcher(client, "usage_metrics", max_delay=60)
+
+    async def run():
+        futures = [batcher.submit({"name": name}) for name in "ab"]
+        # Arrêt avant que la tâche de fond n'ait lu la file
+        await batcher.aclose()
+        return [future.result() for future in futures]
+
+    assert [row["id"] for row in asyncio.run(run())] == ["a", "b"]
+    assert client.inserts == [["a", "b"]]
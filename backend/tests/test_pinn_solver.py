@@ -0,0 +1,93 @@
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import jwt as pyjwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import dependencies
+from api.routers import pinn_solver
+from models.pydantic_models import SimulationStatus
+
+SECRET = "test-secret"
+
+
+class _FakePhysicsModels:
+    async def get_by_id(self, model_id: str):
+        return SimpleNamespace(id=model_id)
+
+
+class _FakeSimulations:
+    def __init__(self):
+        self.statuses = {}
+
+    async def create(self, simulation_data, team_id: str):
+        self.statuses["sim_1"] = SimulationStatus.PENDING
+        return SimpleNamespace(
+            id="sim_1",
+            name=simulation_data.name,
+            status=SimulationStatus.PENDING.value,
+            physics_model_id=simulation_data.physics_model_id,
+            team_id=team_id,
+            input_parameters=simulation_data.input_parameters,
+            geometry_data=None,
+            pinn_predictions=None,
+            convergence_metrics=None,
+            accuracy_metrics=None,
+            execution_time=None,
+            created_at=datetime.now(timezone.utc),
+            completed_at=None,
+        )
+
+    async def update_status(self, simulation_id: str, status: SimulationStatus, results=None):
+        self.statuses[simulation_id] = status
+
+
+@pytest.fixture
+def simulations(monkeypatch):
+    factory = SimpleNamespace(physics_models=_FakePhysicsModels(), simulations=_FakeSimulations())
+    monkeypatch.setattr(dependencies, "_repo_factory", factory)
+    monkeypatch.setattr(dependencies, "SECRET_KEY", SECRET)
+    dependencies._token_cache.clear()
+    yield factory.simulations
+    dependencies._token_cache.clear()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(pinn_solver.router, prefix="/pinn")
+    return TestClient(app)
+
+
+def _headers() -> dict:
+    token = pyjwt.encode({"sub": "user_1", "exp": int(time.time()) + 60}, SECRET, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+_SIMULATION = {"physics_model_id": "model_1", "name": "Plaque chauffée", "input_parameters": {}}
+
+
+def test_failed_publish_marks_simulation_failed(client, simulations, monkeypatch):
+    def broker_down(*args, **kwargs):
+        raise ConnectionError("broker injoignable")
+
+    monkeypatch.setattr(pinn_solver, "run_pinn_simulation_task", SimpleNamespace(delay=broker_down))
+
+    response = client.post("/pinn/simulations", json=_SIMULATION, headers=_headers())
+
+    assert response.status_code == 500
+    assert simulations.statuses == {"sim_1": SimulationStatus.FAILED}
+
+
+def test_published_simulation_stays_pending(client, simulations, monkeypatch):
+    published = []
+    monkeypatch.setattr(pinn_solver, "run_pinn_simulation_task", SimpleNamespace(delay=lambda *args: published.append(args)))
+
+    response = client.post("/pinn/simulations", json=_SIMULATION, headers=_headers())
+
+    assert response.status_code == 200
+    assert [simulation_id for simulation_id, _ in published] == ["sim_1"]
+    assert simulations.statuses == {"sim_1": SimulationStatus.PENDING}
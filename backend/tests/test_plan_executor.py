@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from orchestration.plan_executor import PlanExecutor
+
+
+class _FakeDispatcher:
+    """Dispatcher factice : enregistre les vagues d'étapes lancées ensemble."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.waves = []
+        self._running = []
+
+    async def dispatch_task(self, task_type, params):
+        self._running.append(task_type)
+        # Laisse partir toutes les étapes de la même vague avant d'enregistrer
+        await asyncio.sleep(0)
+        if self._running:
+            self.waves.append(sorted(self._running))
+            self._running = []
+        if task_type in self.failing:
+            raise RuntimeError(f"{task_type} en échec")
+        return f"{task_type} ok"
+
+
+@pytest.fixture
+def executor():
+    def build(**kwargs):
+        plan_executor = PlanExecutor()
+        plan_executor.task_dispatcher = _FakeDispatcher(**kwargs)
+        return plan_executor
+    return build
+
+
+def _step(task_type, depends_on=None):
+    step = {"task_type": task_type, "params": {}}
+    if depends_on is not None:
+        step["depends_on"] = depends_on
+    return step
+
+
+def test_independent_steps_run_in_the_same_wave(executor):
+    plan_executor = executor()
+    plan = {"steps": [_step("a", []), _step("b", []), _step("c", [0, 1])]}
+
+    result = asyncio.run(plan_executor.execute_plan(plan))
+
+    assert result["status"] == "success"
+    assert plan_executor.task_dispatcher.waves == [["a", "b"], ["c"]]
+    assert [(step["step"], step["output"]) for step in result["steps"]] == [(1, "a ok"), (2, "b ok"), (3, "c ok")]
+
+
+def test_steps_without_depends_on_run_sequentially(executor):
+    plan_executor = executor()
+    plan = {"steps": [_step("a"), _step("b"), _step("c")]}
+
+    result = asyncio.run(plan_executor.execute_plan(plan))
+
+    assert result["status"] == "success"
+    assert plan_executor.task_dispatcher.waves == [["a"], ["b"], ["c"]]
+
+
+def test_unsatisfiable_dependencies_fail_without_dispatch(executor):
+    plan_executor = executor()
+    plan = {"steps": [_step("a", []), _step("b", [2]), _step("c", [1])]}
+
+    result = asyncio.run(plan_executor.execute_plan(plan))
+
+    assert result["status"] == "failure"
+    assert result["error"] == "Dépendances du plan invalides"
+    assert [step["task_type"] for step in result["steps"]] == ["a"]
+    assert plan_executor.task_dispatcher.waves == [["a"]]
+
+
+def test_failed_step_stops_the_plan_after_its_wave(executor):
+    plan_executor = executor(failing={"b"})
+    plan = {"steps": [_step("a", []), _step("b", []), _step("c", [0]), _step("d", [1])]}
+
+    result = asyncio.run(plan_executor.execute_plan(plan))
+
+    assert result["status"] == "failure"
+    assert result["error"] == "Échec à l'étape 2"
+    assert [(step["task_type"], step["status"]) for step in result["steps"]] == [("a", "success"), ("b", "error")]
+    assert result["steps"][1]["error"] == "b en échec"
+    assert plan_executor.task_dispatcher.waves == [["a", "b"]]
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from orchestration import task_dispatcher
+from orchestration.task_dispatcher import TaskDispatcher
+
+
+class _FakeAsyncResult:
+    def __init__(self, result=None, ready=True):
+        self.result = result
+        self._ready = ready
+
+    def ready(self):
+        return self._ready
+
+
+class _FakeGroupResult:
+    def __init__(self, *results):
+        self.results = list(results)
+
+    def ready(self):
+        return all(result.ready() for result in self.results)
+
+
+class _FakeGroup:
+    def __init__(self, signatures, group_result):
+        self.signatures = list(signatures)
+        self._group_result = group_result
+
+    def apply_async(self):
+        return self._group_result
+
+
+@pytest.fixture
+def celery_group(monkeypatch):
+    def install(group_result):
+        monkeypatch.setattr(task_dispatcher, "group", lambda signatures: _FakeGroup(signatures, group_result))
+        monkeypatch.setattr(task_dispatcher.celery_app, "signature", lambda name, args: (name, args))
+    return install
+
+
+def test_failed_celery_task_only_fails_its_own_request(celery_group):
+    error = RuntimeError("divergence du PINN")
+    celery_group(_FakeGroupResult(_FakeAsyncResult("ok"), _FakeAsyncResult(error)))
+    dispatcher = TaskDispatcher()
+    dispatcher.batch_map["pinn_training"] = dispatcher._run_celery_batch
+
+    async def run():
+        return await asyncio.gather(
+            dispatcher.dispatch_task("pinn_training", {"model": "a"}),
+            dispatcher.dispatch_task("pinn_training", {"model": "b"}),
+            return_exceptions=True,
+        )
+
+    assert asyncio.run(run()) == ["ok", error]
+
+
+def test_unfinished_celery_task_times_out_alone(celery_group, monkeypatch):
+    monkeypatch.setattr(task_dispatcher, "CELERY_RESULT_TIMEOUT", 0)
+    celery_group(_FakeGroupResult(_FakeAsyncResult("ok"), _FakeAsyncResult(ready=False)))
+    dispatcher = TaskDispatcher()
+
+    results = asyncio.run(dispatcher._run_celery_batch("pinn_training", [{}, {}]))
+
+    assert results[0] == "ok"
+    assert isinstance(results[1], TimeoutError)
+
+
+class _RecordingBatches:
+    """batch_map factice : enregistre chaque lot envoyé."""
+
+    def __init__(self, fail_model=None):
+        self.batches = []
+        self.fail_model = fail_model
+
+    async def __call__(self, task_type, params_list):
+        self.batches.append((task_type, [params["model"] for params in params_list]))
+        return [
+            ValueError(params["model"]) if params["model"] == self.fail_model else f"{task_type}:{params['model']}"
+            for params in params_list
+        ]
+
+
+@pytest.fixture
+def recording_dispatcher():
+    def build(**kwargs):
+        dispatcher = TaskDispatcher()
+        batches = _RecordingBatches(**kwargs)
+        dispatcher.batch_map = {"pinn_training": batches, "mesh_generation": batches}
+        return dispatcher, batches
+    return build
+
+
+def test_tasks_in_one_window_are_grouped_by_type_in_order(recording_dispatcher):
+    dispatcher, batches = recording_dispatcher()
+
+    async def run():
+        return await asyncio.gather(
+            dispatcher.dispatch_task("pinn_training", {"model": "a"}),
+            dispatcher.dispatch_task("mesh_generation", {"model": "m"}),
+            dispatcher.dispatch_task("pinn_training", {"model": "b"}),
+            dispatcher.dispatch_task("pinn_training", {"model": "c"}),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == ["pinn_training:a", "mesh_generation:m", "pinn_training:b", "pinn_training:c"]
+    assert sorted(batches.batches) == [("mesh_generation", ["m"]), ("pinn_training", ["a", "b", "c"])]
+
+
+def test_tasks_in_separate_windows_are_sent_separately(recording_dispatcher):
+    dispatcher, batches = recording_dispatcher()
+
+    async def run():
+        first = await dispatcher.dispatch_task("pinn_training", {"model": "a"})
+        second = await dispatcher.dispatch_task("pinn_training", {"model": "b"})
+        return first, second
+
+    assert asyncio.run(run()) == ("pinn_training:a", "pinn_training:b")
+    assert batches.batches == [("pinn_training", ["a"]), ("pinn_training", ["b"])]
+
+
+def test_batch_is_split_at_max_batch_size(recording_dispatcher, monkeypatch):
+    monkeypatch.setattr(TaskDispatcher, "MAX_BATCH_SIZE", 2)
+    dispatcher, batches = recording_dispatcher()
+
+    async def run():
+        return await asyncio.gather(
+            *(dispatcher.dispatch_task("pinn_training", {"model": model}) for model in "abc")
+        )
+
+    assert asyncio.run(run()) == ["pinn_training:a", "pinn_training:b", "pinn_training:c"]
+    assert batches.batches == [("pinn_training", ["a", "b"]), ("pinn_training", ["c"])]
+
+
+def test_error_in_batch_result_fails_only_its_future(recording_dispatcher):
+    dispatcher, _ = recording_dispatcher(fail_model="b")
+
+    async def run():
+        return await asyncio.gather(
+            dispatcher.dispatch_task("pinn_training", {"model": "a"}),
+            dispatcher.dispatch_task("pinn_training", {"model": "b"}),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(run())
+
+    assert first == "pinn_training:a"
+    assert isinstance(second, ValueError)
+
+
+def test_exception_raised_by_batch_send_fails_every_future():
+    dispatcher = TaskDispatcher()
+
+    async def broken_batch(task_type, params_list):
+        raise ConnectionError("broker injoignable")
+
+    dispatcher.batch_map = {"pinn_training": broken_batch}
+
+    async def run():
+        return await asyncio.gather(
+            dispatcher.dispatch_task("pinn_training", {"model": "a"}),
+            dispatcher.dispatch_task("pinn_training", {"model": "b"}),
+            return_exceptions=True,
+        )
+
+    assert [type(result) for result in asyncio.run(run())] == [ConnectionError, ConnectionError]
+
+
+def test_unknown_task_type_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(TaskDispatcher().dispatch_task("teleportation", {}))
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Optional, Dict
+import redis.asyncio as redis
+
+from core.config import get_settings
+from utils.logger import logger
+
+_redis_client: Optional[redis.Redis] = None
+_redis_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Un Redis injoignable doit se traduire par un miss rapide, pas bloquer la requête
+REDIS_SOCKET_TIMEOUT = 0.5
+
+# Compteurs exposés pour le monitoring (hits / misses / erreurs Redis)
+cache_stats: Dict[str, int] = {"hits": 0, "misses": 0, "errors": 0}
+
+
+def get_redis() -> redis.Redis:
+    """Client Redis partagé par le processus (connexions ouvertes à la demande)"""
+    global _redis_client, _redis_loop
+    # Les connexions asyncio sont liées à leur boucle : les tâches Celery
+    # (une boucle par asyncio.run) obtiennent un client neuf
+    loop = asyncio.get_running_loop()
+    if _redis_client is None or _redis_loop is not loop:
+        _redis_client = redis.from_url(
+            get_settings().REDIS_URL,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        )
+        _redis_loop = loop
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """
+    Ferme le client Redis de la boucle courante et son pool de connexions
+    (fin d'un asyncio.run dans une tâche Celery, arrêt de l'API)
+    """
+    global _redis_client, _redis_loop
+    client = _redis_client
+    if client is None or _redis_loop is not asyncio.get_running_loop():
+        return
+    _redis_client = None
+    _redis_loop = None
+    await client.aclose()
+
+
+async def cache_hget(key: str, field: str) -> Optional[bytes]:
+    """Lit un champ d'une entrée hash ; une panne Redis est traitée comme un miss"""
+    try:
+        value = await get_redis().hget(key, field)
+    except Exception as e:
+        cache_stats["errors"] += 1
+        logger.warning("Redis HGET failed for %s: %s", key, e)
+        return None
+
+    if value is None:
+        cache_stats["misses"] += 1
+    else:
+        cache_stats["hits"] += 1
+    return value
+
+
+async def cache_hset(key: str, field: str, value: bytes, ttl: int) -> None:
+    """Écrit un champ d'une entrée hash et (ré)arme son expiration"""
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            await pipe.hset(key, field, value).expire(key, ttl).execute()
+    except Exception as e:
+        cache_stats["errors"] += 1
+        logger.warning("Redis HSET failed for %s: %s", key, e)
+
+
+async def cache_delete(key: str) -> None:
+    """Invalide une entrée ; les erreurs Redis sont ignorées (l'entrée expirera)"""
+    try:
+        await get_redis().delete(key)
+    except Exception as e:
+        cache_stats["errors"] += 1
+        logger.warning("Redis DEL failed for %s: %s", key, e)
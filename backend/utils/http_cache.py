@@ -0,0 +1,24 @@
+import hashlib
+from typing import Any, Dict
+
+import orjson
+from fastapi import Request, Response
+
+
+class StaticJSONResponse:
+    """
+    Payload JSON invariant, sérialisé une seule fois avec son ETag.
+
+    `respond` renvoie 304 Not Modified (corps vide) quand le client présente
+    déjà la bonne version via If-None-Match, sinon les octets pré-encodés.
+    """
+
+    def __init__(self, content: Dict[str, Any], cache_control: str = "public, max-age=3600"):
+        self.body = orjson.dumps(content)
+        self.etag = f'W/"{hashlib.md5(self.body).hexdigest()}"'
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def respond(self, request: Request) -> Response:
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
@@ -8,6 +8,8 @@ and other shared functionality across the platform.
 from .logger import setup_logger, pinn_logger, copilot_logger, optimization_logger, api_logger, database_logger
 from .validators import PhysicsValidator, CodeValidator, DataValidator
 from .performance import PerformanceMonitor, MemoryOptimizer, timer, performance_context
+from .cache import get_redis, close_redis, cache_hget, cache_hset, cache_delete, cache_stats
+from .http_cache import StaticJSONResponse
 
 __all__ = [
     "setup_logger",
@@ -22,5 +24,12 @@ __all__ = [
     "PerformanceMonitor",
     "MemoryOptimizer",
     "timer",
-    "performance_context"
+    "performance_context",
+    "get_redis",
+    "close_redis",
+    "cache_hget",
+    "cache_hset",
+    "cache_delete",
+    "cache_stats",
+    "StaticJSONResponse"
 ]
@@ -5,6 +5,7 @@ import psutil
 import GPUtil
 import threading
 from contextlib import contextmanager
+import numpy as np
 
 def timer(func: Callable) -> Callable:
     @wraps(func)
@@ -54,10 +55,8 @@ class PerformanceMonitor:
         if len(loss_history) < 10:
             return False
             
-        recent_losses = loss_history[-10:]
-        improvements = [abs(recent_losses[i-1] - recent_losses[i]) for i in range(1, len(recent_losses))]
-        
-        avg_improvement = sum(improvements) / len(improvements)
+        recent_losses = np.asarray(loss_history[-10:])
+        avg_improvement = np.abs(np.diff(recent_losses)).mean()
         return avg_improvement < threshold
     
     def record_metrics(self, metrics: Dict[str, Any]):
@@ -28,9 +28,10 @@ fi
 # Utilisation de 'supabase db diff' ou 'supabase db push' selon l'outil.
 # Ici, nous supposons l'utilisation de l'outil de migration Python du projet ou Supabase CLI.
 
-# Option 1: Utilisation de l'outil de migration Python (si le projet en a un)
+# Option 1: Utilisation de l'outil de migration Python du projet
+# (jamais dans le lifespan de l'API : une seule exécution par déploiement)
 # echo "Exécution des migrations via l'outil Python..."
-# python -m database.migrations up
+# (cd backend && python -m database.migrations)
 
 # Option 2: Utilisation de Supabase CLI (pour les projets Supabase)
 echo "Exécution des migrations via Supabase CLI..."
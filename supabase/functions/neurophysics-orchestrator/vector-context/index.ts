@@ -23,6 +23,60 @@ Deno.serve(async (req: Request) => {
 
     const body = await req.json();
     console.log("VectorContext: Body JSON validé.");
+
+    // Mode batch : { queries: [{ query, context_id }] } -> { results: [...] }
+    // Les documents sont lus une seule fois et l'historique de toutes les
+    // sessions en une seule requête (filtre IN), au lieu d'un aller-retour par requête.
+    if (Array.isArray(body.queries)) {
+      const queries: { query: string; context_id?: string | null }[] = body.queries;
+      console.log(`VectorContext: Mode batch (${queries.length} requêtes).`);
+
+      const { data: documents, error: docError } = await supabaseClient
+        .from("documents")
+        .select("content, metadata")
+        .limit(3);
+
+      if (docError) {
+          console.error(`VectorContext: Erreur DB documents: ${docError.message}`);
+          throw docError;
+      }
+
+      const contextIds = [...new Set(queries.map((q) => q.context_id).filter((id) => !!id))];
+      const latestByContext = new Map<string, unknown>();
+
+      if (contextIds.length > 0) {
+        const { data: history, error: histError } = await supabaseClient
+          .from("session_history")
+          .select("context_id, request, result")
+          .in("context_id", contextIds)
+          .order("created_at", { ascending: false });
+
+        if (histError) {
+            console.error(`VectorContext: Erreur DB historique: ${histError.message}`);
+            throw histError;
+        }
+
+        for (const row of history || []) {
+          if (!latestByContext.has(row.context_id)) {
+            latestByContext.set(row.context_id, { request: row.request, result: row.result });
+          }
+        }
+      }
+
+      const results = queries.map(({ query, context_id }) => ({
+        relevant_documents: documents || [],
+        previous_results: context_id && latestByContext.has(context_id) ? [latestByContext.get(context_id)] : [],
+        context_id: context_id,
+        query: query,
+      }));
+
+      console.log("VectorContext: Contextes batch compilés et envoyés.");
+
+      return new Response(JSON.stringify({ results }), {
+        headers: { ...corsHeaders, "Content-Type": "application/json" },
+        status: 200,
+      });
+    }
     
     // Validation stricte (minimaliste)
     if (!body.query || !body.context_id) {
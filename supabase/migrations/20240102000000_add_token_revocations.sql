@@ -0,0 +1,13 @@
+-- Migration: add token_revocations table used by the API to reject JWTs issued before a revocation
+BEGIN;
+
+-- 1. One row per user: the latest instant at which all of the user's tokens were invalidated
+CREATE TABLE IF NOT EXISTS public.token_revocations (
+  user_id uuid PRIMARY KEY,
+  revoked_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- 2. Enable RLS: only the service_role (backend) reads or writes revocations
+ALTER TABLE public.token_revocations ENABLE ROW LEVEL SECURITY;
+
+COMMIT;
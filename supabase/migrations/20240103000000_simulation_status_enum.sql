@@ -0,0 +1,18 @@
+-- Migration: store simulations.status as a Postgres enum instead of free-form text
+BEGIN;
+
+-- 1. Allowed simulation states (mirrors models.pydantic_models.SimulationStatus)
+DO $$
+BEGIN
+  CREATE TYPE public.simulation_status AS ENUM ('pending', 'running', 'completed', 'failed');
+EXCEPTION
+  WHEN duplicate_object THEN NULL;
+END $$;
+
+-- 2. Convert the column: 4-byte enum values, and typos are rejected at write time
+ALTER TABLE public.simulations
+  ALTER COLUMN status DROP DEFAULT,
+  ALTER COLUMN status TYPE public.simulation_status USING status::public.simulation_status,
+  ALTER COLUMN status SET DEFAULT 'pending';
+
+COMMIT;